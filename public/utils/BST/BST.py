@@ -1,5 +1,8 @@
 #Implementation of Binary search Tree (BST) using python
 
+from array import array
+from collections import deque
+
 # Define a node class for the tree
 # Each node contains 3 :
 #   data: data stored in the node
@@ -7,19 +10,116 @@
 #   right: Pointer to the right child
 
 class Node:
+    # __slots__ removes the per-node __dict__, which saves memory on trees with many nodes
+    __slots__ = ('data', 'left', 'right')
+
     def __init__(self, data):
         self.data = data
         self.left = None
         self.right = None
 
+# Values returned by delete, telling how the node was removed
+NO_CHILDREN = "no children"    # Node was a leaf and was removed directly
+ONE_CHILD = "one child"        # Node was replaced by its only child
+TWO_CHILDREN = "two children"  # Node's data was replaced by its inorder successor, which was removed
+
 class BinarySearchTree:
+    node_class = Node  # Class used to create new nodes. Subclasses storing extra data per node override this
+
     def __init__(self):
         self.root = None  # Initialize the root node of BST
 
+    @classmethod
+    def from_sorted(cls, sorted_data):
+        # Build a perfectly balanced tree from data that is already sorted in increasing order, in O(n).
+        # Much faster than calling insert n times, since no walk from the root is needed per key
+        tree = cls()
+        nodes = []
+        for data in sorted_data:
+            if nodes and not nodes[-1].data < data:
+                raise Exception(f'Data must be sorted and unique. Found {data} after {nodes[-1].data}')
+            nodes.append(tree.node_class(data))
+        tree.root = tree._link_balanced(nodes, 0, len(nodes) - 1)
+        return tree
+
+    def _link_balanced(self, nodes, start, end):
+        # Link the sorted list of nodes[start..end] into a balanced subtree and return its root.
+        # The middle node becomes the root, left half the left subtree and right half the right subtree.
+        # Recursion depth is O(log n)
+        if start > end:
+            return None
+        mid = (start + end) // 2
+        node = nodes[mid]
+        node.left = self._link_balanced(nodes, start, mid - 1)
+        node.right = self._link_balanced(nodes, mid + 1, end)
+        self._update(node)
+        return node
+
+    def _update(self, node):
+        # Recalculate the extra data stored in node from its children. Plain BST nodes have nothing to update
+        pass
+
+    def _inorder_nodes(self):
+        # Yield nodes in sorted order, using an explicit stack instead of recursion
+        stack = []
+        current_node = self.root
+        while stack or current_node:
+            while current_node:
+                stack.append(current_node)
+                current_node = current_node.left
+            current_node = stack.pop()
+            yield current_node
+            current_node = current_node.right
+
+    def _is_small_batch(self, batch_size):
+        # Check whether m * log(n) < n, i.e. inserting the batch key by key is cheaper than relinking the tree.
+        # Only counts nodes until the answer is known, so this is O(min(n, m log n))
+        count = 0
+        for _ in self._inorder_nodes():
+            count += 1
+            if count > batch_size * count.bit_length():
+                return True
+        return False
+
+    def insert_many(self, data_list):
+        # Insert a batch of data at once.
+        # Large batches: the batch is sorted, merged with the existing nodes (which are already in sorted order)
+        # and the whole tree is relinked in balanced form: O(n + m log m) instead of m walks from the root.
+        # Small batches (m log n < n): relinking all n nodes costs more, so the keys are inserted one by one.
+        # In both cases nothing is inserted if one of the keys is a duplicate.
+        # Existing nodes are reused, so references returned by search stay valid
+        batch = sorted(data_list)
+
+        if self._is_small_batch(len(batch)):
+            for index, data in enumerate(batch):
+                if (index > 0 and not batch[index - 1] < data) or self.search(data) is not None:
+                    raise Exception(f'Node with data {data} already exists in the tree. Cannot insert duplicate data')
+            for data in batch:
+                self.insert(data)
+            return
+
+        existing = list(self._inorder_nodes())
+        merged = []
+        i, j = 0, 0
+
+        # Merge the existing nodes and the new data. Nothing is changed in the tree until the merge succeeds
+        while i < len(existing) or j < len(batch):
+            if j == len(batch) or (i < len(existing) and existing[i].data < batch[j]):
+                node = existing[i]
+                i += 1
+            else:
+                node = self.node_class(batch[j])
+                j += 1
+            if merged and not merged[-1].data < node.data:
+                raise Exception(f'Node with data {node.data} already exists in the tree. Cannot insert duplicate data')
+            merged.append(node)
+
+        self.root = self._link_balanced(merged, 0, len(merged) - 1)
+
     def insert(self, data):
         # Base condition: if tree is empty, insert at root
         if self.root is None:
-            self.root = Node(data)
+            self.root = self.node_class(data)
             return
         
         #start traversing from the root node
@@ -30,14 +130,14 @@ class BinarySearchTree:
             #   else move to left child of current_node and repeat
             if data < current_node.data:
                 if current_node.left is None:
-                    current_node.left = Node(data)
+                    current_node.left = self.node_class(data)
                     break
                 current_node = current_node.left
 
             # Similarly for right node
             elif data > current_node.data:
                 if current_node.right is None:
-                    current_node.right = Node(data)
+                    current_node.right = self.node_class(data)
                     break
                 current_node = current_node.right
 
@@ -65,7 +165,9 @@ class BinarySearchTree:
         return current_node
     
     def delete(self, data):
-        # Search for the element in the current tree and delete if found
+        # Search for the element in the current tree and delete if found.
+        # Returns which case was applied: NO_CHILDREN, ONE_CHILD or TWO_CHILDREN.
+        # The tree is walked only once, also when the inorder successor has to be removed
 
         parent = None
         node_to_delete = self.root
@@ -78,68 +180,563 @@ class BinarySearchTree:
             else:
                 node_to_delete = node_to_delete.right
 
-        if node_to_delete == None:
+        if node_to_delete is None:
             raise Exception(f"Node with data {data} does not exists in the tree.")
-        
-        # Case 1: node_to_delete has no childres
-        #       Delete the node directly
-
-        if node_to_delete.left is None and node_to_delete.right is None:   
-            print(f"Node {data} has no children. Deleting directly")
-            if node_to_delete != self.root:
-                # Check whether node_to_delete is left or right child to its parent. Remove the reference accordingly.
-                if parent.left == node_to_delete:
-                    parent.left = None
-                else:
-                    parent.right = None
-            else:
-                self.root = None
 
-        # Case 2: node_to_delete has 2 children
-        #       find the inorder successor of the node_to_delete.
-        #       Inorder succcessor will be the leaf node which is smallest after node_to_delete
-        #       Replace the node_to_delete with the inorder successor
+        # Case 1: node_to_delete has 2 children
+        #       find the inorder successor of the node_to_delete, continuing down from node_to_delete.
+        #       Inorder succcessor is the smallest node in the right subtree, so it has no left child
+        #       Copy the data of the inorder successor into node_to_delete and unlink the successor,
+        #       its right child (if any) takes its place
 
-        elif node_to_delete.left and node_to_delete.right:
-            print(f"Node {data} has two children, {node_to_delete.left.data} and {node_to_delete.right.data}. \
-                  \nReplacing with the inorder successor and deleting the inorder successor")
-            successor = self.inorder_successor(node_to_delete.right)
-            print("Inorder successor: ", successor.data)
-            successor_data = successor.data
-            self.delete(successor.data)
-            node_to_delete.data = successor_data
+        if node_to_delete.left and node_to_delete.right:
+            successor_parent = node_to_delete
+            successor = node_to_delete.right
+            while successor.left:
+                successor_parent = successor
+                successor = successor.left
 
+            node_to_delete.data = successor.data
+            if successor_parent is node_to_delete:
+                successor_parent.right = successor.right
+            else:
+                successor_parent.left = successor.right
+            return TWO_CHILDREN
 
-        # Case 3: node_to_delete has exactly one child
-        #       Child should replace the node_to_delete
+        # Case 2: node_to_delete has no children or exactly one child
+        #       Child (None if there are no children) should replace the node_to_delete
         #       check whether node_to_delete is left or right child to its parent.
         #           update the reference of parent with the child of node_to_delete
 
-        elif node_to_delete.left or node_to_delete.right:
-            child = node_to_delete.left if node_to_delete.left else node_to_delete.right
-            print(f"Node {data} has one child. Replacing with child {child.data}")
-            if node_to_delete != self.root:
-                if node_to_delete == parent.left:
-                    parent.left = child
-                else:
-                    parent.right = child
+        child = node_to_delete.left if node_to_delete.left else node_to_delete.right
+        if parent is None:
+            self.root = child
+        elif parent.left is node_to_delete:
+            parent.left = child
+        else:
+            parent.right = child
+        return ONE_CHILD if child else NO_CHILDREN
+
+    # Traversals
+    # All traversals are generators that yield the data of the nodes one by one.
+    # They use an explicit stack (or queue) instead of recursion, so deep trees do not hit the recursion limit,
+    # and memory used is O(height) (O(width) for level order) instead of a list of all the data.
+    # The tree must not be modified while a traversal is in progress.
+
+    def inorder(self): # Left, node, right: data in increasing order
+        for node in self._inorder_nodes():
+            yield node.data
+
+    def reverse_inorder(self): # Right, node, left: data in decreasing order
+        stack = []
+        current_node = self.root
+        while stack or current_node:
+            while current_node:
+                stack.append(current_node)
+                current_node = current_node.right
+            current_node = stack.pop()
+            yield current_node.data
+            current_node = current_node.left
+
+    def preorder(self): # Node, left, right
+        stack = [self.root] if self.root else []
+        while stack:
+            node = stack.pop()
+            yield node.data
+            # Push right first so that left is visited first
+            if node.right:
+                stack.append(node.right)
+            if node.left:
+                stack.append(node.left)
+
+    def postorder(self): # Left, right, node
+        stack = []
+        last_visited = None
+        current_node = self.root
+        while stack or current_node:
+            while current_node:
+                stack.append(current_node)
+                current_node = current_node.left
+            node = stack[-1]
+            # Visit the right subtree first if it exists and was not visited yet
+            if node.right and node.right is not last_visited:
+                current_node = node.right
             else:
-                self.root = child
+                stack.pop()
+                yield node.data
+                last_visited = node
 
+    def level_order(self): # Level by level, from left to right
+        queue = deque([self.root] if self.root else [])
+        while queue:
+            node = queue.popleft()
+            yield node.data
+            if node.left:
+                queue.append(node.left)
+            if node.right:
+                queue.append(node.right)
+
+    def range(self, low, high):
+        # Yield the data between low and high (both included) in increasing order.
+        # Subtrees that are entirely below low or above high are never visited, so this is O(log n + k)
+        # for a balanced tree, where k is the number of data yielded
+        stack = []
+        current_node = self.root
+        while True:
+            # Go down the left side, skipping nodes (and their left subtrees) that are below low
+            while current_node:
+                if current_node.data < low:
+                    current_node = current_node.right
+                else:
+                    stack.append(current_node)
+                    current_node = current_node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if node.data > high:
+                return
+            yield node.data
+            current_node = node.right
 
     def inorder_traversal(self): # Print inorder traversal of nodes in tree
         if self.root is None:
             return
-        self._inorder(self.root)
+        for data in self.inorder():
+            print(data, end = " ")
         print()
-
-    def _inorder(self, node):
-        if node:
-            self._inorder(node.left)
-            print(node.data, end = " ")
-            self._inorder(node.right)
         
-                
+
+
+# Self balancing BST (AVL tree)
+# Inserting already sorted keys into a plain BST makes every new node the right child of the previous one,
+# so the tree turns into a linked chain and insert/search/delete become O(n).
+# An AVL tree keeps the heights of the left and right subtree of every node within 1 of each other
+# by rotating nodes after insert and delete. This keeps the height O(log n) for any insertion order.
+
+# Each AVL node also stores the height of the subtree rooted at it
+class AVLNode(Node):
+    __slots__ = ('height',)
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.height = 1
+
+class AVLTree(BinarySearchTree):
+    # Same insert/search/delete API as BinarySearchTree. search is inherited as it is.
+    node_class = AVLNode
+
+    def _height(self, node):
+        return node.height if node else 0
+
+    def _update(self, node):
+        # Recalculate the height of node from its children (and any other data stored by parent classes)
+        node.height = 1 + max(self._height(node.left), self._height(node.right))
+        super()._update(node)
+
+    def _balance_factor(self, node):
+        return self._height(node.left) - self._height(node.right)
+
+    def _rotate_right(self, node):
+        #        node            new_root
+        #       /                /      \
+        #   new_root    ->     ...      node
+        #         \                     /
+        #        middle              middle
+        new_root = node.left
+        node.left = new_root.right
+        new_root.right = node
+        self._update(node)
+        self._update(new_root)
+        return new_root
+
+    def _rotate_left(self, node):
+        # Mirror image of _rotate_right
+        new_root = node.right
+        node.right = new_root.left
+        new_root.left = node
+        self._update(node)
+        self._update(new_root)
+        return new_root
+
+    def _rebalance(self, node):
+        # Update the height of node and rotate if its subtrees differ in height by more than 1.
+        # Returns the new root of this subtree
+        self._update(node)
+        balance = self._balance_factor(node)
+
+        # Left heavy
+        if balance > 1:
+            # Left-Right case: first rotate the left child to the left
+            if self._balance_factor(node.left) < 0:
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+
+        # Right heavy
+        if balance < -1:
+            # Right-Left case: first rotate the right child to the right
+            if self._balance_factor(node.right) > 0:
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+
+        return node
+
+    def insert(self, data):
+        self.root = self._insert(self.root, data)
+
+    def _insert(self, node, data):
+        # Insert data in the subtree rooted at node and return the new root of the subtree.
+        # Recursion depth is bounded by the height of the tree, which is O(log n)
+        if node is None:
+            return self.node_class(data)
+
+        if data < node.data:
+            node.left = self._insert(node.left, data)
+        elif data > node.data:
+            node.right = self._insert(node.right, data)
+        else:
+            raise Exception(f'Node with data {data} already exists in the tree. Cannot insert duplicate data')
+
+        return self._rebalance(node)
+
+    def delete(self, data):
+        # Returns which case was applied, like BinarySearchTree.delete
+        self.root, case = self._delete(self.root, data)
+        return case
+
+    def _delete(self, node, data):
+        # Delete data from the subtree rooted at node.
+        # Returns the new root of the subtree and the case applied (NO_CHILDREN, ONE_CHILD or TWO_CHILDREN)
+        if node is None:
+            raise Exception(f"Node with data {data} does not exists in the tree.")
+
+        if data < node.data:
+            node.left, case = self._delete(node.left, data)
+        elif data > node.data:
+            node.right, case = self._delete(node.right, data)
+
+        # Found the node. No child or one child: replace it with its child
+        elif node.left is None or node.right is None:
+            child = node.left if node.left else node.right
+            return child, ONE_CHILD if child else NO_CHILDREN
+
+        # Two children: unlink the inorder successor (smallest node of the right subtree)
+        # in the same descent and copy its data into this node
+        else:
+            node.right, successor = self._remove_min(node.right)
+            node.data = successor.data
+            case = TWO_CHILDREN
+
+        return self._rebalance(node), case
+
+    def _remove_min(self, node):
+        # Unlink the smallest node of the subtree rooted at node, rebalancing on the way back up.
+        # Returns the new root of the subtree and the unlinked node
+        if node.left is None:
+            return node.right, node
+        node.left, smallest = self._remove_min(node.left)
+        return self._rebalance(node), smallest
+
+
+# Order statistic tree
+# Each node also stores the number of nodes in the subtree rooted at it (size).
+# With the sizes, the k-th smallest data and the number of data below x can be found
+# by walking a single path from the root, i.e. in O(height) instead of an inorder traversal.
+
+class SizedNode(Node):
+    __slots__ = ('size',)
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.size = 1
+
+class OrderStatisticTree(BinarySearchTree):
+    node_class = SizedNode
+
+    def _size(self, node):
+        return node.size if node else 0
+
+    def _update(self, node):
+        # Recalculate the size of node from its children
+        node.size = 1 + self._size(node.left) + self._size(node.right)
+        super()._update(node)
+
+    def insert(self, data):
+        if self.root is None:
+            self.root = self.node_class(data)
+            return
+
+        # Find the place to insert, remembering the path from the root.
+        # Sizes are only changed once we know data is not a duplicate
+        path = []
+        current_node = self.root
+        while current_node:
+            path.append(current_node)
+            if data < current_node.data:
+                current_node = current_node.left
+            elif data > current_node.data:
+                current_node = current_node.right
+            else:
+                raise Exception(f'Node with data {data} already exists in the tree. Cannot insert duplicate data')
+
+        parent = path[-1]
+        if data < parent.data:
+            parent.left = self.node_class(data)
+        else:
+            parent.right = self.node_class(data)
+
+        # Every node on the path has one more node in its subtree
+        for node in path:
+            node.size += 1
+
+    def delete(self, data):
+        # Same as BinarySearchTree.delete, also updating the sizes. Returns which case was applied
+        # Find the node to be deleted, remembering the path from the root
+        path = []
+        parent = None
+        node_to_delete = self.root
+        while node_to_delete and node_to_delete.data != data:
+            path.append(node_to_delete)
+            parent = node_to_delete
+            if data < node_to_delete.data:
+                node_to_delete = node_to_delete.left
+            else:
+                node_to_delete = node_to_delete.right
+
+        if node_to_delete is None:
+            raise Exception(f"Node with data {data} does not exists in the tree.")
+
+        # Two children: the inorder successor is removed from the tree instead and its data moved into node_to_delete.
+        # Continue the path down to the successor so its ancestors get their sizes updated too
+        case = NO_CHILDREN
+        if node_to_delete.left and node_to_delete.right:
+            case = TWO_CHILDREN
+            path.append(node_to_delete)
+            parent = node_to_delete
+            successor = node_to_delete.right
+            while successor.left:
+                path.append(successor)
+                parent = successor
+                successor = successor.left
+            node_to_delete.data = successor.data
+            node_to_delete = successor
+
+        # node_to_delete now has at most one child, which takes its place
+        child = node_to_delete.left if node_to_delete.left else node_to_delete.right
+        if parent is None:
+            self.root = child
+        elif parent.left is node_to_delete:
+            parent.left = child
+        else:
+            parent.right = child
+
+        # Every node on the path has one less node in its subtree
+        for node in path:
+            node.size -= 1
+
+        if case == NO_CHILDREN and child:
+            case = ONE_CHILD
+        return case
+
+    def size(self):
+        # Return the number of nodes in the tree
+        return self._size(self.root)
+
+    def select(self, k):
+        # Return the k-th smallest data, counting from 0 (select(0) is the minimum)
+        if k < 0 or k >= self._size(self.root):
+            raise Exception(f"Cannot select index {k}, tree has {self._size(self.root)} nodes")
+
+        current_node = self.root
+        while True:
+            left_size = self._size(current_node.left)
+            if k < left_size:
+                current_node = current_node.left
+            elif k > left_size:
+                # Skip the left subtree and the current node
+                k -= left_size + 1
+                current_node = current_node.right
+            else:
+                return current_node.data
+
+    def _count_below(self, data, include_equal):
+        # Count the data smaller than data (or smaller or equal if include_equal) by walking one path
+        count = 0
+        current_node = self.root
+        while current_node:
+            if data < current_node.data:
+                current_node = current_node.left
+            elif data > current_node.data:
+                # The left subtree and current node are all smaller
+                count += self._size(current_node.left) + 1
+                current_node = current_node.right
+            else:
+                count += self._size(current_node.left)
+                if include_equal:
+                    count += 1
+                break
+        return count
+
+    def rank(self, data):
+        # Return the number of data in the tree smaller than data.
+        # If data is in the tree, this is also its index in sorted order
+        return self._count_below(data, False)
+
+    def count_range(self, low, high):
+        # Return the number of data between low and high (both included)
+        if low > high:
+            return 0
+        return self._count_below(high, True) - self._count_below(low, False)
+
+
+# AVL tree with order statistics: AVLTree's insert and delete update the sizes through _update
+class SizedAVLNode(AVLNode):
+    __slots__ = ('size',)
+
+    def __init__(self, data):
+        super().__init__(data)
+        self.size = 1
+
+class OrderStatisticAVLTree(AVLTree, OrderStatisticTree):
+    node_class = SizedAVLNode
+
+
+# Array backed BST
+# Instead of one Python object per node, node number i is stored at index i of 3 parallel arrays:
+#   keys[i]: data stored in the node
+#   left[i]: index of the left child (-1 if there is no child)
+#   right[i]: index of the right child (-1 if there is no child)
+# Child indices are kept in a typed array of 8 byte integers, and keys too if a typecode is given
+# (for example 'q' for integers or 'd' for floats), so a node costs 24 bytes instead of a full object.
+# Slots of deleted nodes are kept in a free list (chained through the left array) and reused by insert.
+
+NO_NODE = -1
+
+class ArrayBinarySearchTree:
+    def __init__(self, typecode=None):
+        # Keys of any type are stored in a list, numeric keys can use a typed array
+        self.keys = array(typecode) if typecode else []
+        self.left = array('q')
+        self.right = array('q')
+        self.root = NO_NODE
+        self.free = NO_NODE  # First free slot, left[slot] points to the next free slot
+
+    def _new_node(self, data):
+        # Reuse a slot from the free list if there is one, else add a new slot at the end of the arrays
+        if self.free != NO_NODE:
+            slot = self.free
+            self.keys[slot] = data  # First, so a key the typed array rejects leaves the free list unchanged
+            self.free = self.left[slot]
+            self.left[slot] = NO_NODE
+            self.right[slot] = NO_NODE
+        else:
+            slot = len(self.left)
+            self.keys.append(data)
+            self.left.append(NO_NODE)
+            self.right.append(NO_NODE)
+        return slot
+
+    def _free_node(self, slot):
+        # Add the slot to the free list
+        if not isinstance(self.keys, array):
+            self.keys[slot] = None  # Drop the reference to the data
+        self.left[slot] = self.free
+        self.right[slot] = NO_NODE
+        self.free = slot
+
+    def insert(self, data):
+        if self.root == NO_NODE:
+            self.root = self._new_node(data)
+            return
+
+        keys, left, right = self.keys, self.left, self.right
+        current_node = self.root
+        while True:
+            if data < keys[current_node]:
+                if left[current_node] == NO_NODE:
+                    left[current_node] = self._new_node(data)
+                    break
+                current_node = left[current_node]
+            elif data > keys[current_node]:
+                if right[current_node] == NO_NODE:
+                    right[current_node] = self._new_node(data)
+                    break
+                current_node = right[current_node]
+            else:
+                raise Exception(f'Node with data {data} already exists in the tree. Cannot insert duplicate data')
+
+    def search(self, data):
+        # Return the index of the node holding data, None if not found. Its data is keys[index]
+        keys, left, right = self.keys, self.left, self.right
+        current_node = self.root
+        while current_node != NO_NODE:
+            if data == keys[current_node]:
+                return current_node
+            elif data < keys[current_node]:
+                current_node = left[current_node]
+            else:
+                current_node = right[current_node]
+        return None  # data not found
+
+    def _replace_child(self, parent, node, child):
+        # Make child take the place of node under parent
+        if parent == NO_NODE:
+            self.root = child
+        elif self.left[parent] == node:
+            self.left[parent] = child
+        else:
+            self.right[parent] = child
+
+    def delete(self, data):
+        keys, left, right = self.keys, self.left, self.right
+
+        # Find the node to be deleted and its parent
+        parent = NO_NODE
+        node_to_delete = self.root
+        while node_to_delete != NO_NODE and keys[node_to_delete] != data:
+            parent = node_to_delete
+            if data < keys[node_to_delete]:
+                node_to_delete = left[node_to_delete]
+            else:
+                node_to_delete = right[node_to_delete]
+
+        if node_to_delete == NO_NODE:
+            raise Exception(f"Node with data {data} does not exists in the tree.")
+
+        # Two children: move the inorder successor's data into node_to_delete and remove the successor instead.
+        # The successor has no left child, so its right child takes its place
+        if left[node_to_delete] != NO_NODE and right[node_to_delete] != NO_NODE:
+            successor_parent = node_to_delete
+            successor = right[node_to_delete]
+            while left[successor] != NO_NODE:
+                successor_parent = successor
+                successor = left[successor]
+            keys[node_to_delete] = keys[successor]
+            self._replace_child(successor_parent, successor, right[successor])
+            self._free_node(successor)
+
+        # No child or one child: the child (or nothing) takes the place of node_to_delete
+        else:
+            child = left[node_to_delete] if left[node_to_delete] != NO_NODE else right[node_to_delete]
+            self._replace_child(parent, node_to_delete, child)
+            self._free_node(node_to_delete)
+
+    def inorder(self):  # Yield data in increasing order, using an explicit stack
+        stack = []
+        current_node = self.root
+        while stack or current_node != NO_NODE:
+            while current_node != NO_NODE:
+                stack.append(current_node)
+                current_node = self.left[current_node]
+            current_node = stack.pop()
+            yield self.keys[current_node]
+            current_node = self.right[current_node]
+
+    def inorder_traversal(self):  # Print inorder traversal of nodes in tree
+        for data in self.inorder():
+            print(data, end=" ")
+        print()
+
+
 if __name__ == "__main__":
     bst = BinarySearchTree()
     bst.insert(10)
@@ -156,8 +753,42 @@ if __name__ == "__main__":
     bst.inorder_traversal()
 
     try:
-        bst.delete(10)
+        case = bst.delete(10)
+        print(f"Deleted 10, node had {case}")
     except Exception as e:
         print("Cannot delete, " + str(e))
     
     bst.inorder_traversal()
+
+    # AVL tree stays balanced even when keys are inserted in sorted order
+    avl = AVLTree()
+    for key in range(1, 16):
+        avl.insert(key)
+    print("AVL root:", avl.root.data, "height:", avl.root.height)  # root: 8 height: 4
+    avl.delete(8)
+    avl.inorder_traversal()
+
+    # Build a balanced tree from sorted keys in one pass, then add a batch of keys
+    bulk = AVLTree.from_sorted(range(1, 8))
+    bulk.insert_many([12, 9, 10, 8, 11])
+    bulk.inorder_traversal()
+
+    # Array backed tree storing integer keys in typed arrays
+    compact = ArrayBinarySearchTree('q')
+    for key in [10, 8, 12, 6, 9, 11, 14]:
+        compact.insert(key)
+    compact.delete(10)
+    compact.insert(13)  # Reuses the slot freed by the delete
+    compact.inorder_traversal()
+
+    # Lazy traversals and range query
+    print("Preorder:", list(bulk.preorder()))
+    print("Level order:", list(bulk.level_order()))
+    print("Keys between 4 and 9:", list(bulk.range(4, 9)))
+
+    # Order statistics
+    ranked = OrderStatisticAVLTree.from_sorted([10, 20, 30, 40, 50])
+    ranked.insert(35)
+    ranked.delete(20)
+    print("Smallest:", ranked.select(0), "3rd smallest:", ranked.select(2))  # 10, 35
+    print("Keys below 36:", ranked.rank(36), "Keys between 15 and 40:", ranked.count_range(15, 40))  # 3, 3
@@ -2,6 +2,20 @@
 # Can be implemented in 2 ways:
 #   1.Iterative approach
 #   2.Recursive approach    
+# Followed by variants for duplicates (lower/upper bound), exponential and interpolation search
+
+import sys
+import random
+import timeit
+from array import array as typed_array  # "array" is used as a variable name below
+from bisect import bisect_left
+from math import isqrt
+
+# NumPy is optional. It is only used to search many targets at once
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 # 1. Iterative approach
 def binary_search_iterative(arr, target):
@@ -45,14 +59,272 @@ def binary_search_recursive(arr, target, left, right):
     
     # If target is greater, search in the right half
     elif arr[mid] < target:
-        binary_search_recursive(arr, target, mid + 1, right)
+        return binary_search_recursive(arr, target, mid + 1, right)
 
     # If target is smaller, search in the left hal
     else:
-        binary_search_recursive(arr, target, left, mid - 1)
+        return binary_search_recursive(arr, target, left, mid - 1)
+
+
+# 3. Searching many targets at once
+def binary_search_many(arr, targets):
+    # Return the index of each target in arr, -1 for targets not found.
+    # If several elements are equal to a target, the index of the first one is returned.
+    # With a NumPy array, all targets are searched in one vectorised call (np.searchsorted),
+    # so there is no Python loop per target. The result is then a NumPy array too.
+    # Otherwise each target is searched with bisect_left, which runs the binary search loop in C.
+
+    if np is not None and isinstance(arr, np.ndarray):
+        targets = np.asarray(targets)
+        if len(arr) == 0:
+            return np.full(targets.shape, -1, dtype=np.intp)
+
+        # Index where each target would be inserted to keep arr sorted
+        indices = np.searchsorted(arr, targets)
+
+        # A target is found if the element at its insertion index is equal to it.
+        # Insertion index can be len(arr) for targets bigger than every element, clip it to stay in range
+        found = arr[np.minimum(indices, len(arr) - 1)] == targets
+        found &= indices < len(arr)
+        return np.where(found, indices, -1)
+
+    results = []
+    n = len(arr)
+    for target in targets:
+        index = bisect_left(arr, target)
+        results.append(index if index < n and arr[index] == target else -1)
+    return results
+
+
+# 4. Lower bound, upper bound and equal range
+# When the array has duplicates, binary_search_iterative returns the index of any one of them.
+# These return the boundaries of the block of elements equal to target instead.
+def lower_bound(arr, target):
+    # Return the index of the first element >= target (len(arr) if all elements are smaller)
+    left, right = 0, len(arr)
+    while left < right:
+        mid = (left + right) // 2
+        if arr[mid] < target:
+            left = mid + 1  # arr[mid] and everything before it is too small
+        else:
+            right = mid  # arr[mid] may be the answer, keep it in range
+    return left
+
+def upper_bound(arr, target):
+    # Return the index of the first element > target (len(arr) if no element is bigger)
+    left, right = 0, len(arr)
+    while left < right:
+        mid = (left + right) // 2
+        if arr[mid] <= target:
+            left = mid + 1
+        else:
+            right = mid
+    return left
+
+def equal_range(arr, target):
+    # Return (start, end) such that arr[start:end] are all the elements equal to target.
+    # start == end if target is not in the array
+    return lower_bound(arr, target), upper_bound(arr, target)
+
+
+# 5. Exponential (galloping) search
+# Check indices 1, 2, 4, 8, ... until an element >= target is found, then binary search in the last range.
+# Takes O(log i) steps where i is the index of the target, so it is fast when the target is near the start,
+# and it does not need the length of the array: it also works for sorted sources of unknown length,
+# as long as reading past the end raises IndexError.
+
+_END = object()  # Marks a position past the end of the array
+
+def _probe(arr, index):
+    # Return arr[index], or _END if index is past the end of the array
+    try:
+        return arr[index]
+    except IndexError:
+        return _END
+
+def exponential_search(arr, target):
+    # Return the index of the first element equal to target, -1 if not found
+
+    # Find a bound such that arr[bound] >= target (or bound is past the end)
+    bound = 1
+    while True:
+        value = _probe(arr, bound)
+        if value is _END or not value < target:
+            break
+        bound *= 2
+
+    # Target can only be between bound // 2 and bound. Lower bound search in that range,
+    # positions past the end count as bigger than target
+    left, right = bound // 2, bound
+    while left < right:
+        mid = (left + right) // 2
+        value = _probe(arr, mid)
+        if value is not _END and value < target:
+            left = mid + 1
+        else:
+            right = mid
+
+    value = _probe(arr, left)
+    if value is not _END and value == target:
+        return left
+    return -1
+
+
+# 6. Interpolation search
+# Instead of checking the middle, guess the position of target from its value,
+# assuming the numbers are spread evenly between arr[left] and arr[right].
+# O(log log n) steps on average for uniformly distributed numbers, but O(n) in the worst case.
+def interpolation_search(arr, target):
+    # Return the index of target if found, otherwise -1. Only for numbers
+    left, right = 0, len(arr) - 1
+
+    while left <= right and arr[left] <= target <= arr[right]:
+        # All remaining elements are equal, avoid division by zero
+        if arr[left] == arr[right]:
+            return left if arr[left] == target else -1
+
+        # Estimate the position of target between left and right
+        pos = left + int((target - arr[left]) * (right - left) // (arr[right] - arr[left]))
+
+        if arr[pos] == target:
+            return pos
+        elif arr[pos] < target:
+            left = pos + 1
+        else:
+            right = pos - 1
+
+    return -1
+
+
+# 7. Choosing a search algorithm
+# Looks at a few elements of the array to guess which algorithm will need the fewest steps.
+# Only O(1) elements are read, so choosing is much cheaper than the search itself.
+
+UNIFORM_SAMPLE_POINTS = 4  # Number of positions checked to decide if the numbers are evenly spread
+UNIFORM_TOLERANCE = 0.1    # Allowed distance from the expected value, as a fraction of arr[-1] - arr[0]
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def _looks_uniform(arr):
+    # Check whether the numbers in arr grow roughly linearly with the index
+    n = len(arr)
+    first, last = arr[0], arr[-1]
+    if n < 2 * UNIFORM_SAMPLE_POINTS or not (_is_number(first) and _is_number(last)) or first == last:
+        return False
+    for i in range(1, UNIFORM_SAMPLE_POINTS):
+        index = i * (n - 1) // UNIFORM_SAMPLE_POINTS
+        expected = first + (last - first) * index / (n - 1)
+        if not _is_number(arr[index]) or abs(arr[index] - expected) > UNIFORM_TOLERANCE * (last - first):
+            return False
+    return True
+
+def choose_search(arr, target):
+    # Return the search function expected to be fastest for this array and target:
+    #   interpolation_search for evenly spread numbers
+    #   exponential_search if target is within the first sqrt(n) elements
+    #   binary_search_iterative otherwise
+    n = len(arr)
+    if n == 0:
+        return binary_search_iterative
+    if _is_number(target) and _looks_uniform(arr):
+        return interpolation_search
+    if not arr[isqrt(n - 1)] < target:
+        return exponential_search
+    return binary_search_iterative
+
+def search(arr, target):
+    # Return the index of target using the algorithm picked by choose_search, -1 if not found.
+    # With duplicates, any index of target may be returned, use lower_bound to get the first one
+    return choose_search(arr, target)(arr, target)
+
+
+# 8. Static search index in Eytzinger (BFS) layout
+# In a sorted array the first probes of binary search (n/2, n/4, 3n/4, ...) are far apart in memory,
+# so nearly every probe is a cache miss on big arrays.
+# The Eytzinger layout stores the elements in the order of a breadth first traversal of the
+# implicit binary search tree: the root at position 1 and the children of position k at 2k and 2k+1.
+# The first levels of the tree are then next to each other at the start of the array and stay in cache,
+# and the search always walks from k to 2k or 2k+1, which is easy to predict.
+# The index is built once in O(n) and cannot be modified afterwards.
+
+class EytzingerIndex:
+    def __init__(self, sorted_arr, typecode=None):
+        # Numbers can be stored in a typed array (for example typecode 'q' or 'd') to keep them contiguous
+        n = len(sorted_arr)
+        self.n = n
+        self.layout = typed_array(typecode, [0]) * (n + 1) if typecode else [None] * (n + 1)
+        self.original_index = typed_array('q', [0]) * (n + 1)  # Index in sorted_arr of each position
+
+        # Fill positions in inorder (left subtree, node, right subtree): this visits them in sorted order
+        i = 0
+        stack = []
+        k = 1
+        while stack or k <= n:
+            while k <= n:
+                stack.append(k)
+                k = 2 * k
+            k = stack.pop()
+            self.layout[k] = sorted_arr[i]
+            self.original_index[k] = i
+            i += 1
+            k = 2 * k + 1
+
+    def _lower_bound_position(self, target):
+        # Return the position of the first element >= target, 0 if there is none
+        layout, n = self.layout, self.n
+        k = 1
+        while k <= n:
+            # Go left if layout[k] >= target, right otherwise
+            k = 2 * k + (layout[k] < target)
+        # The answer is the last node where we went left. Each right turn added a 1 bit to the end of k,
+        # so remove the trailing 1 bits and the 0 bit of that last left turn
+        return k >> (~k & (k + 1)).bit_length()
+
+    def lower_bound(self, target):
+        # Return the index in the sorted array of the first element >= target (n if there is none)
+        k = self._lower_bound_position(target)
+        return self.original_index[k] if k else self.n
+
+    def search(self, target):
+        # Return the index of target in the sorted array if found, otherwise -1
+        k = self._lower_bound_position(target)
+        if k and self.layout[k] == target:
+            return self.original_index[k]
+        return -1
+
+
+def benchmark_eytzinger(sizes=(1_000, 10_000, 100_000, 1_000_000, 4_000_000), queries=100_000):
+    # Compare binary_search_iterative on the sorted list with EytzingerIndex.search for growing sizes
+    # and print the first size where the Eytzinger layout is faster (the crossover size).
+    # In Python the interpreter overhead per step is big compared to a cache miss,
+    # so the crossover is at bigger sizes than in compiled languages
+    crossover = None
+    print(f"{'size':>10} {'sorted list':>12} {'eytzinger':>12}")
+    for size in sizes:
+        sorted_arr = list(range(0, 2 * size, 2))
+        index = EytzingerIndex(sorted_arr, 'q')
+        targets = [random.randrange(2 * size) for _ in range(queries)]
+
+        plain_time = timeit.timeit(lambda: [binary_search_iterative(sorted_arr, t) for t in targets], number=1)
+        eytzinger_time = timeit.timeit(lambda: [index.search(t) for t in targets], number=1)
+        print(f"{size:>10} {plain_time:>11.3f}s {eytzinger_time:>11.3f}s")
+
+        if crossover is None and eytzinger_time < plain_time:
+            crossover = size
+    if crossover is None:
+        print("Eytzinger layout was not faster for any of the sizes")
+    else:
+        print(f"Eytzinger layout is faster from {crossover} elements")
+    return crossover
 
 
 if __name__ == "__main__":
+    # Run "python binary_search.py benchmark" to compare the Eytzinger index with the sorted list
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        benchmark_eytzinger()
+        sys.exit()
+
     # Array MUST be sorted for binary search
     array = [11, 12, 22, 25, 34, 64, 90]
     
@@ -70,4 +342,21 @@ if __name__ == "__main__":
         print(f"Recursive: Element {target} found at index {result}")
     else:
         print(f"Recursive: Element {target} not found in the array")
-    
\ No newline at end of file
+
+    # Search many targets in one call
+    targets = [22, 90, 13, 11]
+    print(f"Indices of {targets}: {binary_search_many(array, targets)}")  # [2, 6, -1, 0]
+
+    # Searching with duplicates
+    duplicates = [1, 2, 2, 2, 3, 5, 8]
+    print("Equal range of 2:", equal_range(duplicates, 2))  # (1, 4)
+    print("Exponential search 3:", exponential_search(duplicates, 3))  # 4
+
+    # Evenly spread numbers: interpolation search is chosen
+    evens = list(range(0, 200, 2))
+    print(f"{choose_search(evens, 150).__name__} found 150 at index {search(evens, 150)}")  # 75
+
+    # Eytzinger index: same answers, different memory layout
+    index = EytzingerIndex(array)
+    print("Eytzinger layout:", index.layout[1:])  # [25, 12, 64, 11, 22, 34, 90]
+    print(f"Eytzinger index: Element {target} found at index {index.search(target)}")  # 3
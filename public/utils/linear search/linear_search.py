@@ -1,5 +1,22 @@
 # Linear search implementation using python
 
+import os
+import sys
+import mmap
+import struct
+import timeit
+import tempfile
+from array import array as typed_array  # "array" is used as a variable name below
+from collections import deque
+from multiprocessing import shared_memory
+from concurrent.futures import ProcessPoolExecutor
+
+# NumPy is optional. It is only used by the vectorised searches
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 def linear_search(arr, target):
     # Return index of target if found, otherwise return -1
     #If there are multiple occurences of target, return index of first occurence
@@ -21,7 +38,260 @@ def linear_search_all_occurences(arr, target):
     return occurences
 
 
+# Searching many targets in one pass
+# Calling linear_search once per target scans the array once per target: O(n * m).
+# These scan the array once and check each element against a set of the targets: O(n + m).
+# Targets must be hashable. Unhashable elements (lists, dicts, ...) cannot be looked up in the set,
+# they are compared with each target instead, which costs O(m) for each such element.
+
+def linear_search_multiple(arr, targets):
+    # Return a dict mapping each target to the index of its first occurence (-1 if not found).
+    # Stops scanning as soon as every target has been found
+    first_index = {target: -1 for target in targets}
+    remaining = set(first_index)
+
+    for index, element in enumerate(arr):
+        try:
+            found = [element] if element in remaining else []
+        except TypeError:  # Unhashable element
+            found = [target for target in remaining if element == target]
+        for target in found:
+            first_index[target] = index
+            remaining.discard(target)
+        if not remaining:
+            break
+
+    return first_index
+
+def linear_search_all_occurences_multiple(arr, targets):
+    # Return a dict mapping each target to the list of indices of all its occurences ([] if not found)
+    occurences = {target: [] for target in targets}
+
+    for index, element in enumerate(arr):
+        try:
+            indices = occurences.get(element)
+        except TypeError:  # Unhashable element
+            for target, indices in occurences.items():
+                if element == target:
+                    indices.append(index)
+            continue
+        if indices is not None:
+            indices.append(index)
+
+    return occurences
+
+
+# Vectorised linear search
+# The loops above run one Python step per element. These versions compare many elements per step:
+#   - NumPy arrays are compared block by block with NumPy (one C loop per block)
+#   - lists, tuples and array.array use their index() method, which scans in C
+#   - anything else falls back to the loops above (index() of str and bytes looks for substrings)
+# Both still check elements one after the other, so it is O(n) but with a much smaller constant.
+
+BLOCK_SIZE = 1 << 16  # Elements compared per NumPy step. Lets linear_search stop early after a hit
+
+def linear_search_vectorized(arr, target):
+    # Return index of first occurence of target, -1 if not found
+    if np is not None and isinstance(arr, np.ndarray):
+        for start in range(0, len(arr), BLOCK_SIZE):
+            matches = np.flatnonzero(arr[start:start + BLOCK_SIZE] == target)
+            if len(matches):
+                return start + int(matches[0])
+        return -1
+
+    if not isinstance(arr, (list, tuple, typed_array)):
+        return linear_search(arr, target)
+    try:
+        return arr.index(target)
+    except ValueError:
+        return -1
+
+def linear_search_all_occurences_vectorized(arr, target):
+    # Return list of indices of all occurences of target, if not found, return []
+    if np is not None and isinstance(arr, np.ndarray):
+        return np.flatnonzero(arr == target).tolist()
+
+    if not isinstance(arr, (list, tuple, typed_array)):
+        return linear_search_all_occurences(arr, target)
+
+    # Jump from one occurence to the next, index() scans the elements in between in C
+    occurences = []
+    index = -1
+    try:
+        while True:
+            index = arr.index(target, index + 1)
+            occurences.append(index)
+    except ValueError:
+        return occurences
+
+
+# Parallel linear search
+# The array is split into chunks that are searched in separate processes, so all CPU cores are used.
+# Only for NumPy arrays and array.array: their elements are copied once into shared memory
+# (one block copy done in C), and each worker process reads its chunk from there, so no data is pickled.
+# With NumPy a worker searches its chunk in place; without it, the worker copies its own chunk into
+# an array.array (again one block copy in C), since a memoryview has no index() method.
+# Sending a Python list to other processes means pickling every element, which is slower than
+# list.index itself, so lists are always searched with linear_search_vectorized.
+# Starting the worker processes also takes time, so below PARALLEL_MIN_SIZE elements
+# the vectorised search is used directly.
+
+PARALLEL_MIN_SIZE = 1_000_000
+CHUNKS_PER_WORKER = 4  # More chunks than workers, so no chunk after a hit has to be started
+
+def _can_share(arr):
+    # Check whether arr is a typed array whose elements can be copied into shared memory
+    if np is not None and isinstance(arr, np.ndarray):
+        return arr.ndim == 1 and not arr.dtype.hasobject
+    return isinstance(arr, typed_array) and arr.typecode != 'u'
+
+def _copy_to_shared_memory(arr):
+    # Copy the elements of arr into a new shared memory block. Returns the block and the element type
+    if np is not None and isinstance(arr, np.ndarray):
+        shared = shared_memory.SharedMemory(create=True, size=max(arr.nbytes, 1))
+        np.ndarray(arr.shape, dtype=arr.dtype, buffer=shared.buf)[:] = arr
+        return shared, arr.dtype.str
+    shared = shared_memory.SharedMemory(create=True, size=max(len(arr) * arr.itemsize, 1))
+    shared.buf[:len(arr) * arr.itemsize] = memoryview(arr).cast('B')
+    return shared, arr.typecode
+
+def _search_shared_chunk(name, element_type, start, end, target, find_all):
+    # Runs in a worker process: search the elements start to end - 1 of the shared memory block name.
+    # Returns the index of the first occurence (-1 if none), or the list of all indices if find_all
+    shared = shared_memory.SharedMemory(name=name)
+    try:
+        if np is not None:
+            itemsize = np.dtype(element_type).itemsize
+            chunk = np.frombuffer(shared.buf, dtype=element_type, count=end - start, offset=start * itemsize)
+        else:
+            chunk = typed_array(element_type)
+            chunk.frombytes(shared.buf[start * chunk.itemsize:end * chunk.itemsize])
+
+        if find_all:
+            result = [start + index for index in linear_search_all_occurences_vectorized(chunk, target)]
+        else:
+            index = linear_search_vectorized(chunk, target)
+            result = start + index if index != -1 else -1
+        del chunk  # The view on the shared memory must be gone before closing it
+        return result
+    finally:
+        shared.close()
+
+def _search_chunks(arr, target, workers, find_all):
+    # Yield the result of each chunk, in the order of the chunks.
+    # Chunks are submitted a few at a time, as results come back, so stopping early
+    # (first occurence found) leaves the remaining chunks unstarted
+    shared, element_type = _copy_to_shared_memory(arr)
+    chunk_size = max(1, -(-len(arr) // (workers * CHUNKS_PER_WORKER)))
+    starts = iter(range(0, len(arr), chunk_size))
+    executor = ProcessPoolExecutor(workers)
+    try:
+        pending = deque()
+
+        def submit_next():
+            start = next(starts, None)
+            if start is not None:
+                end = min(start + chunk_size, len(arr))
+                pending.append(executor.submit(_search_shared_chunk, shared.name, element_type, start, end, target, find_all))
+
+        # Keep every worker busy with one chunk, plus one chunk waiting
+        for _ in range(2 * workers):
+            submit_next()
+        while pending:
+            result = pending.popleft().result()
+            submit_next()
+            yield result
+    finally:
+        executor.shutdown(cancel_futures=True)
+        shared.close()
+        shared.unlink()
+
+def linear_search_parallel(arr, target, workers=None):
+    # Return index of first occurence of target, -1 if not found
+    workers = workers or os.cpu_count() or 1
+    if len(arr) < PARALLEL_MIN_SIZE or workers == 1 or not _can_share(arr):
+        return linear_search_vectorized(arr, target)
+
+    # The first chunk with a hit has the first occurence, the chunks after it are not needed anymore
+    for index in _search_chunks(arr, target, workers, find_all=False):
+        if index != -1:
+            return index
+    return -1
+
+def linear_search_all_occurences_parallel(arr, target, workers=None):
+    # Return list of indices of all occurences of target, if not found, return []
+    workers = workers or os.cpu_count() or 1
+    if len(arr) < PARALLEL_MIN_SIZE or workers == 1 or not _can_share(arr):
+        return linear_search_all_occurences_vectorized(arr, target)
+
+    # Chunks come back in order, so the merged list is sorted
+    occurences = []
+    for chunk_occurences in _search_chunks(arr, target, workers, find_all=True):
+        occurences.extend(chunk_occurences)
+    return occurences
+
+
+def benchmark_linear_search(size=20_000_000):
+    # Time the search for the last element of a typed array of size integers
+    big_array = typed_array('q', range(size))
+    target = size - 1
+    for search in (linear_search, linear_search_vectorized, linear_search_parallel):
+        seconds = timeit.timeit(lambda: search(big_array, target), number=1)
+        print(f"{search.__name__:<28} {seconds:.3f}s")
+
+
+# Streaming linear search
+# The functions above need the whole array in memory. These read the data one element at a time,
+# so the memory used stays the same whatever the size of the data.
+
+def linear_search_stream(iterable, target):
+    # Return index of first occurence of target in any iterable (generator, file lines, ...), -1 if not found.
+    # Stops reading as soon as target is found
+    for index, element in enumerate(iterable):
+        if element == target:
+            return index
+    return -1
+
+def linear_search_all_occurences_stream(iterable, target):
+    # Yield the index of each occurence of target in any iterable, as they are found
+    for index, element in enumerate(iterable):
+        if element == target:
+            yield index
+
+def linear_search_file(path, target, record_format):
+    # Yield the index of each record equal to target in a binary file of fixed width records.
+    # record_format is a struct format, for example "<q" for little endian 8 byte integers.
+    # Byte offset of a record in the file is index * struct.calcsize(record_format).
+    # The file is memory mapped, so the operating system loads the pages as they are read,
+    # and the scan is done in C by mmap.find on the packed bytes of target
+    # (records are compared as bytes, so for floats 0.0 and -0.0 are different)
+    record_size = struct.calcsize(record_format)
+    pattern = struct.pack(record_format, *(target if isinstance(target, tuple) else (target,)))
+
+    with open(path, "rb") as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            return  # Empty files cannot be memory mapped
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            offset = data.find(pattern)
+            while offset != -1:
+                # A match that does not start at a record boundary spans 2 records,
+                # continue at the start of the next record
+                if offset % record_size == 0:
+                    yield offset // record_size
+                    offset = data.find(pattern, offset + record_size)
+                else:
+                    offset = data.find(pattern, offset + record_size - offset % record_size)
+
+def linear_search_file_first(path, target, record_format):
+    # Return index of first record equal to target in a binary file of fixed width records, -1 if not found
+    return next(linear_search_file(path, target, record_format), -1)
+
+
 if __name__ == '__main__':
+    # Run "python linear_search.py benchmark" to compare the plain, vectorised and parallel searches
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        benchmark_linear_search()
+        sys.exit()
     
     array = [64, 34, 25, 12, 22, 11, 90, 25]
     
@@ -37,4 +307,19 @@ if __name__ == '__main__':
     if all_occurences:
         print(f"Element {target} found at indices: {all_occurences}")
     else:
-        print(f"Element {target} not found in the array")
\ No newline at end of file
+        print(f"Element {target} not found in the array")
+
+    # Vectorised versions give the same results
+    print("Vectorised:", linear_search_vectorized(array, target), linear_search_all_occurences_vectorized(array, target))
+
+    # Streaming search over a generator and a binary file
+    print("Stream:", linear_search_stream((x * x for x in range(100)), 49))  # 7
+    with tempfile.NamedTemporaryFile(suffix=".bin", delete=False) as file:
+        for element in array:
+            file.write(struct.pack("<q", element))
+    print("File:", list(linear_search_file(file.name, target, "<q")))  # [2, 7]
+    os.remove(file.name)
+
+    # Several targets in one pass
+    print("First occurences:", linear_search_multiple(array, [25, 90, 7]))  # {25: 2, 90: 6, 7: -1}
+    print("All occurences:", linear_search_all_occurences_multiple(array, [25, 11]))  # {25: [2, 7], 11: [5]}
@@ -8,11 +8,78 @@ class Node:
         self.data = data
         self.next = None
 
+# Node of a doubly linked list also stores the reference to the previous node
+class DoublyNode(Node):
+    def __init__(self, data):
+        super().__init__(data)
+        self.prev = None
+
 # Create Linked List class
+# Besides the HEAD, the list keeps a TAIL pointer to the last node and the number of nodes,
+# so insert (at the end) and length are O(1) instead of walking the whole list.
+# With doubly=True every node also points to the previous node, which makes delete_tail O(1):
+# in a singly linked list the node before the tail can only be found by walking from the HEAD.
 class LinkedList:
-    def __init__(self):
-        # Initialize an empty linked list with head pointer
+    def __init__(self, doubly=False):
+        # Initialize an empty linked list with head and tail pointers
         self.head = None
+        self.tail = None
+        self.count = 0
+        self.doubly = doubly
+
+    @classmethod
+    def from_iterable(cls, iterable, doubly=False):
+        # Create a linked list with the elements of iterable (list, range, generator, ...) in order
+        linked_list = cls(doubly)
+        linked_list.extend(iterable)
+        return linked_list
+
+    def _new_node(self, data):
+        return DoublyNode(data) if self.doubly else Node(data)
+
+    def extend(self, iterable):
+        # Insert all elements of iterable at the end of the list, in one pass.
+        # The new nodes are first linked to each other, then the whole chain is linked after the TAIL
+        first_node = last_node = None
+        added = 0
+        node_class = DoublyNode if self.doubly else Node
+        for data in iterable:
+            new_node = node_class(data)
+            if last_node is None:
+                first_node = new_node
+            else:
+                last_node.next = new_node
+                if self.doubly:
+                    new_node.prev = last_node
+            last_node = new_node
+            added += 1
+
+        if first_node is None:
+            return  # Nothing to add
+
+        if self.is_empty():
+            self.head = first_node
+        else:
+            self.tail.next = first_node
+            if self.doubly:
+                first_node.prev = self.tail
+        self.tail = last_node
+        self.count += added
+
+    def __iter__(self):
+        # Yield the data of the nodes from HEAD to TAIL, one at a time (for data in linked_list: ...)
+        current_node = self.head
+        while current_node is not None:
+            yield current_node.data
+            current_node = current_node.next
+
+    def __len__(self):
+        # len(linked_list)
+        return self.count
+
+    def to_list(self):
+        # Return a Python list with the data of the nodes in order
+        return list(self)
 
     def is_empty(self):
         # Check if the linked list is empty
@@ -20,12 +87,7 @@ class LinkedList:
     
     def length(self):
          # Return the number of nodes in the list
-        length = 0
-        current_node = self.head
-        while current_node is not None:
-            current_node = current_node.next
-            length += 1
-        return length
+        return self.count
     
     def display(self):
         # Display the linked list 
@@ -39,37 +101,47 @@ class LinkedList:
     
     def insert(self, data):
         # Insert the data at the end of the list
-        new_node = Node(data)
+        new_node = self._new_node(data)
 
         # If list is empty, insert the node at HEAD
         if self.is_empty():
             self.head = new_node
 
-        # else insert the node at the end of the list
+        # else link the node after the TAIL, no need to traverse the list
         else:
-            # start from head
-            current_node = self.head
-            # Traverse till the end of the list
-            while current_node.next:
-                current_node = current_node.next
-            # Set the 'next' of the current_node node to new node
-            current_node.next = new_node
+            self.tail.next = new_node
+            if self.doubly:
+                new_node.prev = self.tail
+
+        # The new node is the last node
+        self.tail = new_node
+        self.count += 1
 
     def insert_at_index(self, data, index):
         # Insert new node at a specified index
         if index < 0:
             raise Exception("Invalid index for insertion")
+        if index > self.count:
+            raise Exception("Invalid index to insert. Index out of range")
+
+        # Inserting after the last node is the same as insert
+        if index == self.count:
+            self.insert(data)
+            return
         
         # Create a new node
-        new_node = Node(data)
+        new_node = self._new_node(data)
         
         if index == 0:
             # Insert the node at the beginning
 
             # set the pointer to new_node to the first element in list i.e., the element which HEAD is pointing to
             new_node.next = self.head
+            if self.doubly:
+                self.head.prev = new_node
             # update the HEAD pointer to point to the newly inserted node
             self.head = new_node
+            self.count += 1
             return
         
         # Inserting at a specified index
@@ -79,17 +151,16 @@ class LinkedList:
 
         #Iterate till one node before insertion point
         for i in range(index - 1):
-            if current_node is None:
-                raise Exception("Invalid index to insert. Index out of range")
             current_node = current_node.next # Move to next node
-
-        if current_node is None:
-            raise Exception("Invalid index to insert. Index out of range")
         
         # Copy the current node pointer to the new node pointer, so that new node points to the correct next node
         new_node.next = current_node.next
+        if self.doubly:
+            new_node.prev = current_node
+            new_node.next.prev = new_node
         #update the current node pointer to point to the newly inserted node
         current_node.next = new_node
+        self.count += 1
 
     def delete_head(self):
         # Delete the first node (head) of the list and return its value
@@ -98,6 +169,12 @@ class LinkedList:
         current_node = self.head
         self.head = current_node.next
 
+        if self.head is None:
+            self.tail = None  # List is now empty
+        elif self.doubly:
+            self.head.prev = None
+        self.count -= 1
+
         return current_node.data
 
     def delete_tail(self):
@@ -107,18 +184,23 @@ class LinkedList:
         
         # If list has only one element, delete and return it
         if self.head.next is None:
-            deleted_node = self.head
-            return deleted_node.data
-        
-        # Start from HEAD and traverse till last but one element
-        current_node = self.head
-        while current_node.next.next is not None:
-            current_node = current_node.next
-        
-        deleted_node = current_node.next
+            return self.delete_head()
+
+        deleted_node = self.tail
+
+        # Find the last but one element: directly in a doubly linked list,
+        # else start from HEAD and traverse till last but one element
+        if self.doubly:
+            current_node = deleted_node.prev
+        else:
+            current_node = self.head
+            while current_node.next.next is not None:
+                current_node = current_node.next
 
         # Remove reference to the last node
         current_node.next = None
+        self.tail = current_node
+        self.count -= 1
         return deleted_node.data
 
     def delete_at_index(self, index):
@@ -128,23 +210,28 @@ class LinkedList:
         
         if index < 0:
             raise Exception("Invalid index for insertion")
+
+        if index >= self.count:
+            raise Exception("Invalid index for deletion. Index out of range")
         
         if index == 0:
             return self.delete_head()
+
+        if index == self.count - 1:
+            return self.delete_tail()
         
         # start from HEAD
         current_node = self.head
 
         # Iterate till one node before the deletion point
         for i in range(index - 1):
-            if current_node is None:
-                raise Exception("Invalid index for deletion. Index out of range")
             current_node = current_node.next
-        if current_node.next is None:
-            raise Exception("Invalid index for deletion. Index out of range")
         
         deleted_node = current_node.next
         current_node.next = deleted_node.next
+        if self.doubly:
+            deleted_node.next.prev = current_node
+        self.count -= 1
 
         return deleted_node.data
     
@@ -196,4 +283,18 @@ if __name__ == "__main__":
     print("Deleted tail:", ll.delete_tail())  # 4
     ll.display()
     print("Deleted at index 1:", ll.delete_at_index(1))
-    ll.display()      
\ No newline at end of file
+    ll.display()
+
+    # Doubly linked list: deleting the tail does not traverse the list
+    dll = LinkedList(doubly=True)
+    for i in range(1, 6):
+        dll.insert(i)
+    print("Deleted tail:", dll.delete_tail())  # 5
+    dll.display()
+    print("Linked list length: ", dll.length())  # 4
+
+    # Build a list from an iterable and iterate over it
+    squares = LinkedList.from_iterable(i * i for i in range(1, 6))
+    squares.extend([36, 49])
+    print("Squares:", squares.to_list(), "length:", len(squares))
+    print("Even squares:", [data for data in squares if data % 2 == 0])
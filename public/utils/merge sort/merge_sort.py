@@ -1,10 +1,37 @@
 # Merge sort implementation usinq python
 
-def merge_sort(arr): # returns a sorted array
+import os
+import sys
+import timeit
+import tempfile
+from bisect import bisect_left, bisect_right
+from array import array
+from heapq import heapify, heappop, heapreplace
+from concurrent.futures import ProcessPoolExecutor
+
+# NumPy is optional. It is only used to sort numeric arrays faster
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+def merge_sort(arr, key=None, reverse=False): # returns a sorted array
+    # key: function computing the value to compare for each element (called once per element)
+    # reverse: sort from biggest to smallest, equal elements keep their order
+    # NumPy arrays are returned as a sorted NumPy array, everything else as a list
+    # (typed numeric arrays are sorted with NumPy when it is installed, but still returned as a list)
+
+    # Sort the indices of the elements (see argsort), then pick the elements in that order
+    if key is not None or reverse or _numeric_view(arr) is not None:
+        order = argsort(arr, key, reverse)
+        values = _numeric_view(arr) if key is None else None
+        if values is not None:
+            return values[order] if isinstance(arr, np.ndarray) else values[order].tolist()
+        return [arr[i] for i in order]
 
     # Base condition
     if len(arr) <= 1:
-        return arr
+        return arr if isinstance(arr, list) else list(arr)
     
     # calculate the middle index of the array
     mid = len(arr) // 2
@@ -42,10 +69,412 @@ def merge(left, right): # Merge 2 sorted arrays into one sorted array
     return result
 
 
+# Indirect sorting
+# argsort returns the indices of the elements in sorted order (the sorting permutation) instead of
+# the sorted elements, so big records are not moved around and can stay in place.
+# Each key is computed once and stored next to the index: the list sorted is made of (key, index) pairs.
+# As all indices are different, two pairs are never equal, so elements with equal keys stay in their
+# original order (stable sort) and the records themselves are never compared.
+
+def _numeric_view(arr):
+    # Return arr as a NumPy array if it is a NumPy array or a typed numeric array.array, otherwise None.
+    # array.array is wrapped without copying
+    if np is None:
+        return None
+    if isinstance(arr, np.ndarray):
+        return arr
+    if isinstance(arr, array) and arr.typecode != 'u':
+        return np.frombuffer(arr, dtype=arr.typecode)
+    return None
+
+def argsort(arr, key=None, reverse=False): # returns the list of indices of arr in sorted order
+    # (a NumPy array of indices if arr is a NumPy array)
+    n = len(arr)
+
+    # Fast path: NumPy sorts numbers in C. kind="stable" is a merge sort (radix sort for small integers)
+    values = _numeric_view(arr) if key is None else None
+    if values is not None:
+        if not reverse:
+            order = np.argsort(values, kind="stable")
+        else:
+            # Sort the reversed array and reverse the result: descending order, equal elements in original order
+            order = (n - 1) - np.argsort(values[::-1], kind="stable")[::-1]
+        return order if isinstance(arr, np.ndarray) else order.tolist()
+
+    keys = map(key, arr) if key is not None else arr
+    if reverse:
+        # Negated index: among equal keys, the pair with the smaller index is bigger,
+        # so after reversing the ascending order equal keys are still in their original order
+        pairs = [(element_key, -i) for i, element_key in enumerate(keys)]
+        natural_merge_sort(pairs)
+        return [-i for _, i in reversed(pairs)]
+
+    pairs = [(element_key, i) for i, element_key in enumerate(keys)]
+    natural_merge_sort(pairs)
+    return [i for _, i in pairs]
+
+
+# Bottom-up merge sort
+# merge_sort above creates new lists at every level (slices and merge results) and uses recursion.
+# This version sorts the list in place without recursion:
+#   1. Sort small runs of INSERTION_SORT_CUTOFF elements with insertion sort (fast for small runs)
+#   2. Merge neighbouring runs of width 1x, 2x, 4x, ... the cutoff until one run covers the array
+# Only one extra list (the buffer) of the same size as the array is allocated.
+# Each pass merges from one list into the other, so no copying back is needed between passes.
+
+INSERTION_SORT_CUTOFF = 32
+
+def insertion_sort(arr, start, end): # Sort arr[start:end] in place
+    for i in range(start + 1, end):
+        item = arr[i]
+        j = i - 1
+        # Shift bigger elements one place to the right
+        while j >= start and arr[j] > item:
+            arr[j + 1] = arr[j]
+            j -= 1
+        arr[j + 1] = item
+
+def merge_into(source, target, start, mid, end):
+    # Merge sorted source[start:mid] and source[mid:end] into target[start:end]
+    left_index, right_index = start, mid
+    for target_index in range(start, end):
+        # Take from left while it is not exhausted and its element is not bigger (keeps equal elements in order)
+        if left_index < mid and (right_index >= end or source[left_index] <= source[right_index]):
+            target[target_index] = source[left_index]
+            left_index += 1
+        else:
+            target[target_index] = source[right_index]
+            right_index += 1
+
+def merge_sort_bottom_up(arr): # Sorts arr in place and returns it
+    n = len(arr)
+
+    # Sort small runs with insertion sort
+    for start in range(0, n, INSERTION_SORT_CUTOFF):
+        insertion_sort(arr, start, min(start + INSERTION_SORT_CUTOFF, n))
+    if n <= INSERTION_SORT_CUTOFF:
+        return arr
+
+    # Merge runs of doubling width, alternating between arr and the buffer
+    source, target = arr, [None] * n
+    width = INSERTION_SORT_CUTOFF
+    while width < n:
+        for start in range(0, n, 2 * width):
+            mid = min(start + width, n)
+            end = min(start + 2 * width, n)
+            merge_into(source, target, start, mid, end)
+        source, target = target, source
+        width *= 2
+
+    # The sorted elements are in source. Copy them back if that is the buffer
+    if source is not arr:
+        arr[:] = source
+    return arr
+
+
+# K-way merge
+# Same as merge, but for any number of sorted arrays.
+# A min-heap holds the next element of each array, so picking the smallest takes O(log k) instead of O(k).
+def merge_k(sorted_arrays): # Merge k sorted arrays into one sorted array
+    # Heap entries are (element, array number, index in array).
+    # For equal elements the array number decides, so elements of earlier arrays come first (stable)
+    heap = [(array[0], i, 0) for i, array in enumerate(sorted_arrays) if array]
+    heapify(heap)
+    result = []
+
+    while heap:
+        element, i, index = heap[0]
+        result.append(element)
+        index += 1
+        # Replace the taken element by the next one of the same array, or remove the array if it is done
+        if index < len(sorted_arrays[i]):
+            heapreplace(heap, (sorted_arrays[i][index], i, index))
+        else:
+            heappop(heap)
+
+    return result
+
+
+# Parallel merge sort
+# The array is split into one chunk per CPU core, the chunks are sorted at the same time in
+# separate processes and the sorted chunks are combined with merge_k.
+# Starting processes and sending the chunks to them takes time,
+# so arrays smaller than PARALLEL_SORT_MIN_SIZE are sorted in this process.
+
+PARALLEL_SORT_MIN_SIZE = 100_000
+
+def merge_sort_parallel(arr, workers=None): # returns a sorted array
+    workers = workers or os.cpu_count() or 1
+    if len(arr) < PARALLEL_SORT_MIN_SIZE or workers == 1:
+        return merge_sort_bottom_up(list(arr))
+
+    chunk_size = -(-len(arr) // workers)  # Round up so there are at most `workers` chunks
+    chunks = [list(arr[start:start + chunk_size]) for start in range(0, len(arr), chunk_size)]
+
+    with ProcessPoolExecutor(workers) as executor:
+        sorted_chunks = list(executor.map(merge_sort_bottom_up, chunks))
+
+    return merge_k(sorted_chunks)
+
+
+# External merge sort
+# For files too big to fit in memory. Works on text files, one element per line, lines compared as strings.
+#   1. Read the file in runs of at most memory_budget bytes, sort each run in memory
+#      and write it to a temporary file
+#   2. Merge up to fan_in run files at a time into a bigger run, until at most fan_in runs are left
+#   3. Merge the last runs while reading them line by line, into the output file or as a generator
+# Only one run (step 1) or one line per merged run (steps 2 and 3) is in memory at a time.
+
+EXTERNAL_MEMORY_BUDGET = 64 * 1024 * 1024  # Bytes of memory per run
+EXTERNAL_FAN_IN = 64                       # Run files merged at once (number of files open at once)
+RUN_SLOT_SIZE = 2 * 8  # Bytes per line besides the string: one pointer in the run, one in the merge buffer
+
+def merge_k_streams(iterators):
+    # Same as merge_k, but reads the sorted inputs lazily and yields the merged elements one by one
+    heap = []
+    for i, iterator in enumerate(iterators):
+        for element in iterator:
+            heap.append((element, i))
+            break
+    heapify(heap)
+
+    while heap:
+        element, i = heap[0]
+        yield element
+        for next_element in iterators[i]:
+            heapreplace(heap, (next_element, i))
+            break
+        else:
+            heappop(heap)  # Input i is exhausted
+
+def _write_run(lines, directory):
+    # Write lines to a new temporary file and return its path
+    with tempfile.NamedTemporaryFile("w", dir=directory, suffix=".run", delete=False) as run_file:
+        run_file.writelines(lines)
+    return run_file.name
+
+def _merge_runs(run_paths):
+    # Yield the lines of the sorted run files, merged. Each run file is deleted once it is done
+    run_files = [open(path) for path in run_paths]
+    try:
+        yield from merge_k_streams(run_files)
+    finally:
+        for run_file, path in zip(run_files, run_paths):
+            run_file.close()
+            os.remove(path)
+
+def _external_sort_lines(input_file, memory_budget, fan_in):
+    with tempfile.TemporaryDirectory() as directory:
+        # 1. Sort runs that fit in memory.
+        # A line costs the size of its string object (about 50 bytes more than its length),
+        # plus the list slots that point to it
+        run_paths = []
+        with input_file:
+            run, run_size = [], 0
+            for line in input_file:
+                if not line.endswith("\n"):
+                    line += "\n"  # Last line of the file may have no newline
+                run.append(line)
+                run_size += sys.getsizeof(line) + RUN_SLOT_SIZE
+                if run_size >= memory_budget:
+                    run_paths.append(_write_run(merge_sort_bottom_up(run), directory))
+                    run, run_size = [], 0
+            if run:
+                run_paths.append(_write_run(merge_sort_bottom_up(run), directory))
+
+        # 2. Merge groups of fan_in runs until few enough runs are left
+        while len(run_paths) > fan_in:
+            run_paths = [_write_run(_merge_runs(run_paths[start:start + fan_in]), directory)
+                         for start in range(0, len(run_paths), fan_in)]
+
+        # 3. Final merge
+        yield from _merge_runs(run_paths)
+
+def external_merge_sort(input_path, output_path=None, memory_budget=EXTERNAL_MEMORY_BUDGET, fan_in=EXTERNAL_FAN_IN):
+    # Sort the lines of input_path.
+    # Writes them to output_path and returns output_path, or if no output_path is given,
+    # returns a generator of the sorted lines (temporary files are removed once it is exhausted or closed).
+    # output_path may be input_path: the sorted lines are written to a temporary file next to it,
+    # which then replaces output_path
+    if fan_in < 2:
+        raise Exception("fan_in must be at least 2 to merge runs")
+
+    # Open the input now, so a missing file raises here and not on the first line read from the generator
+    sorted_lines = _external_sort_lines(open(input_path), memory_budget, fan_in)
+    if output_path is None:
+        return sorted_lines
+
+    output_directory = os.path.dirname(os.path.abspath(output_path))
+    with tempfile.NamedTemporaryFile("w", dir=output_directory, suffix=".tmp", delete=False) as output_file:
+        try:
+            output_file.writelines(sorted_lines)
+        except BaseException:
+            output_file.close()
+            os.remove(output_file.name)
+            raise
+    if os.path.exists(output_path):
+        os.chmod(output_file.name, os.stat(output_path).st_mode)  # Temporary files are only readable by their owner
+    os.replace(output_file.name, output_path)
+    return output_path
+
+
+# Natural (adaptive) merge sort
+# Real data often already contains sorted parts. Instead of always splitting the array in halves,
+# this version finds the runs that are already sorted and only merges those:
+#   1. Scan the array for runs. A strictly descending run is reversed in place.
+#      Runs shorter than min_run are extended with insertion sort, so there are not too many tiny runs
+#   2. Push each run on a stack and merge the top runs while the stack breaks the rules
+#      A > B + C and B > C (A, B, C the lengths of the 3 top runs). This keeps merges balanced,
+#      like the halves of merge_sort, and the stack small (O(log n) runs)
+#   3. Merge the runs left on the stack
+# An already sorted array is a single run and is sorted in O(n).
+
+MIN_GALLOP = 7  # Consecutive wins of one side after which merge_runs switches to galloping
+
+def min_run_length(n):
+    # Return a run length between 16 and 32 such that n / min_run is a power of 2 or a bit less,
+    # so the final merges are balanced
+    extra_bit = 0
+    while n >= 32:
+        extra_bit |= n & 1
+        n >>= 1
+    return n + extra_bit
+
+def merge_runs(arr, start, mid, end):
+    # Merge the sorted runs arr[start:mid] and arr[mid:end] in place
+
+    # Elements at the start of the left run that are <= the first element of the right run
+    # and elements at the end of the right run that are >= the last element of the left run
+    # are already in their place. Find them with binary search and leave them out
+    start = bisect_right(arr, arr[mid], start, mid)
+    end = bisect_left(arr, arr[mid - 1], mid, end)
+    if start == mid or mid == end:
+        return
+
+    left = arr[start:mid]  # Copy of the left run, the merged elements are written over it in arr
+    left_index, right_index, target_index = 0, mid, start
+    left_wins = right_wins = 0
+
+    while left_index < len(left) and right_index < end:
+        if left[left_index] <= arr[right_index]:
+            arr[target_index] = left[left_index]
+            left_index += 1
+            left_wins, right_wins = left_wins + 1, 0
+        else:
+            arr[target_index] = arr[right_index]
+            right_index += 1
+            left_wins, right_wins = 0, right_wins + 1
+        target_index += 1
+
+        # Galloping: when one side keeps winning, it probably has a long stretch of smaller elements.
+        # Find the end of that stretch with binary search and move it in one slice assignment
+        if left_wins >= MIN_GALLOP and right_index < end:
+            count = bisect_right(left, arr[right_index], left_index) - left_index
+            arr[target_index:target_index + count] = left[left_index:left_index + count]
+            left_index += count
+            target_index += count
+            left_wins = 0
+        elif right_wins >= MIN_GALLOP and left_index < len(left):
+            count = bisect_left(arr, left[left_index], right_index, end) - right_index
+            arr[target_index:target_index + count] = arr[right_index:right_index + count]
+            right_index += count
+            target_index += count
+            right_wins = 0
+
+    # Remaining elements of the right run are already in place, copy the remaining ones of the left run
+    arr[target_index:target_index + len(left) - left_index] = left[left_index:]
+
+def natural_merge_sort(arr): # Sorts arr in place and returns it
+    n = len(arr)
+    min_run = min_run_length(n)
+    runs = []  # Stack of (start, length) of sorted runs, next to each other in arr
+
+    def merge_at(i):
+        # Merge runs[i] with runs[i + 1]
+        start, length = runs[i]
+        next_start, next_length = runs[i + 1]
+        merge_runs(arr, start, next_start, next_start + next_length)
+        runs[i] = (start, length + next_length)
+        del runs[i + 1]
+
+    start = 0
+    while start < n:
+        # 1. Find the run starting at start
+        end = start + 1
+        if end < n and arr[end] < arr[start]:
+            # Strictly descending (strict so equal elements keep their order when reversed)
+            while end < n and arr[end] < arr[end - 1]:
+                end += 1
+            arr[start:end] = arr[start:end][::-1]
+        else:
+            while end < n and arr[end] >= arr[end - 1]:
+                end += 1
+
+        # Extend short runs
+        if end - start < min_run:
+            end = min(start + min_run, n)
+            insertion_sort(arr, start, end)
+
+        # 2. Push the run and merge while the stack rules are broken
+        runs.append((start, end - start))
+        while len(runs) > 1:
+            i = len(runs) - 2
+            if i > 0 and runs[i - 1][1] <= runs[i][1] + runs[i + 1][1]:
+                # A <= B + C: merge B with the smaller of A and C
+                merge_at(i - 1 if runs[i - 1][1] < runs[i + 1][1] else i)
+            elif runs[i][1] <= runs[i + 1][1]:
+                merge_at(i)  # B <= C
+            else:
+                break
+        start = end
+
+    # 3. Merge the remaining runs, from the top of the stack
+    while len(runs) > 1:
+        merge_at(len(runs) - 2)
+    return arr
+
+
+def benchmark_merge_sort(size=1_000_000):
+    # Time the single process and the parallel merge sort on a list of size shuffled integers
+    big_array = [(i * 7919) % 1_000_003 for i in range(size)]
+    expected = sorted(big_array)
+    for sort in (merge_sort_bottom_up, merge_sort_parallel):
+        data = list(big_array)
+        start = timeit.default_timer()
+        result = sort(data)
+        seconds = timeit.default_timer() - start
+        print(f"{sort.__name__:<22} {seconds:.3f}s correct: {result == expected}")
+
+
 if __name__ == "__main__":
+    # Run "python merge_sort.py benchmark" to compare the single process and the parallel merge sort
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        benchmark_merge_sort()
+        sys.exit()
 
     unsorted_array = [64, 34, 25, 12, 22, 11, 90]
     print("Unsorted array:", unsorted_array)
     
     sorted_array = merge_sort(unsorted_array)
     print("Sorted array:", sorted_array)
+
+    # Sorting in place with one buffer
+    in_place_array = [64, 34, 25, 12, 22, 11, 90]
+    merge_sort_bottom_up(in_place_array)
+    print("Sorted in place:", in_place_array)
+
+    # Sorting records by a key, and getting the sorting permutation
+    records = [("bob", 25), ("alice", 30), ("carol", 25), ("dave", 35)]
+    print("By age, oldest first:", merge_sort(records, key=lambda record: record[1], reverse=True))
+    print("Order of indices by name:", argsort(records, key=lambda record: record[0]))  # [1, 0, 2, 3]
+
+    # Nearly sorted input: two sorted runs, found and merged directly
+    nearly_sorted = list(range(0, 20, 2)) + list(range(1, 20, 2))
+    print("Natural merge sort:", natural_merge_sort(nearly_sorted))
+
+    # Sorting a file with a tiny memory budget, to force several runs and merge passes
+    with tempfile.NamedTemporaryFile("w", suffix=".txt", delete=False) as input_file:
+        input_file.write("\n".join(str(element) for element in unsorted_array))
+    sorted_lines = external_merge_sort(input_file.name, memory_budget=200, fan_in=2)
+    print("Externally sorted lines:", [line.strip() for line in sorted_lines])
+    os.remove(input_file.name)
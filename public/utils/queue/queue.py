@@ -1,54 +1,799 @@
 #Queue implementation using python
 
+import os
+import sys
+import mmap
+import time
+import pickle
+import struct
+import asyncio
+import tempfile
+import threading
+import importlib.util
+from collections import deque
+
 MAX_QUEUE_SIZE = 15
 
 class Queue:
-    def __init__(self):
-        # Initialize empty list to store queue elements.
-        self.queue_items = []
+    # Circular buffer implementation.
+    # Items are stored in a fixed size list. The front item is at index `start` and the following
+    # items (towards the rear) come after it, wrapping around to index 0 at the end of the list.
+    # Inserting or deleting at either end only moves `start` or changes `count`, so every operation is O(1),
+    # unlike list.insert(0, item) which has to shift all the items.
+
+    def __init__(self, capacity=MAX_QUEUE_SIZE):
+        # capacity: maximum number of items, None for a queue without limit (the buffer grows when needed)
+        self.capacity = capacity
+        self.items = [None] * (capacity if capacity is not None else 8)
+        self.start = 0  # Index of the front item
+        self.count = 0  # Number of items in the queue
+
+    def _index(self, position):
+        # Index in self.items of the item at position (0 is the front, count - 1 is the rear)
+        return (self.start + position) % len(self.items)
+
+    def _make_room(self, extra):
+        # Check that extra more items fit, growing the buffer if the queue has no limit
+        if self.capacity is not None:
+            if self.count + extra > self.capacity:
+                raise Exception(f"Queue is full, cannot insert more than {self.capacity} items")
+            return
+
+        if self.count + extra > len(self.items):
+            # Copy the items in order (front first) into a buffer at least twice as big.
+            # Doubling makes growing O(1) per item on average
+            new_size = max(2 * len(self.items), self.count + extra)
+            self.items = self._slice(0, self.count) + [None] * (new_size - self.count)
+            self.start = 0
+
+    def _slice(self, first, last):
+        # Return the list of items from position first to position last - 1, front to rear.
+        # The items are in at most 2 parts of the buffer: until its end, and from its beginning
+        size = last - first
+        if size <= 0:
+            return []
+        begin = self._index(first)
+        end = begin + size
+        if end <= len(self.items):
+            return self.items[begin:end]
+        return self.items[begin:] + self.items[:end - len(self.items)]
+
+    def _clear_slice(self, first, last):
+        # Drop the references to the items from position first to last - 1, so they can be freed
+        size = last - first
+        begin = self._index(first)
+        end = begin + size
+        if end <= len(self.items):
+            self.items[begin:end] = [None] * size
+        else:
+            self.items[begin:] = [None] * (len(self.items) - begin)
+            self.items[:end - len(self.items)] = [None] * (end - len(self.items))
 
     def is_empty(self):
         # Check if queue is empty or not.
-        return len(self.queue_items) == 0
+        return self.count == 0
     
     def is_full(self):
         # Check if queue is full
-        return len(self.queue_items) >= MAX_QUEUE_SIZE
+        return self.capacity is not None and self.count >= self.capacity
     
     def insert_front(self, item):
         # Add item to the front of the queue
-        if not self.is_full():
-            self.queue_items.insert(0, item)
-        else:
-            raise Exception(f"Queue is full, cannot insert more than {MAX_QUEUE_SIZE} items")
+        self._make_room(1)
+        self.start = (self.start - 1) % len(self.items)
+        self.items[self.start] = item
+        self.count += 1
+
+    def insert_rear(self, item):
+        # Add item to the rear of the queue
+        self._make_room(1)
+        self.items[self._index(self.count)] = item
+        self.count += 1
         
     def delete_rear(self):
         # Remove and return the rear item from the queue
         if not self.is_empty():
-            return self.queue_items.pop()
+            index = self._index(self.count - 1)
+            item = self.items[index]
+            self.items[index] = None
+            self.count -= 1
+            return item
+        else:
+            raise Exception("Queue is empty.")
+
+    def delete_front(self):
+        # Remove and return the front item from the queue
+        if not self.is_empty():
+            item = self.items[self.start]
+            self.items[self.start] = None
+            self.start = (self.start + 1) % len(self.items)
+            self.count -= 1
+            return item
         else:
             raise Exception("Queue is empty.")
         
     def front(self):
         # Check the front element in the queue
         if not self.is_empty():
-            return self.queue_items[0]
+            return self.items[self.start]
         else:
             raise Exception("Queue is empty.")
         
     def rear(self):
         # Check the rear element in the queue
         if not self.is_empty():
-            return self.queue_items[-1]
+            return self.items[self._index(self.count - 1)]
         else:
             raise Exception("Queue is empty.")
         
     def size(self):
         # Return the number of items in the queue
-        return len(self.queue_items)
+        return self.count
+
+    def extend(self, items):
+        # Insert all items at the front, in order: same as calling insert_front for each item.
+        # Either all items are inserted or, if they do not fit, none of them
+        items = list(items)
+        self._make_room(len(items))
+        if not items:
+            return
+
+        # The last item inserted ends up at the front, so the items are stored in reverse order before start
+        size = len(items)
+        self.start = (self.start - size) % len(self.items)
+        end = self.start + size
+        items.reverse()
+        if end <= len(self.items):
+            self.items[self.start:end] = items
+        else:
+            split = len(self.items) - self.start
+            self.items[self.start:] = items[:split]
+            self.items[:end - len(self.items)] = items[split:]
+        self.count += size
+
+    def drain(self, n=None):
+        # Remove up to n items from the rear (all items if n is None) and return them
+        # in the order delete_rear would have returned them
+        n = self.count if n is None else max(0, min(n, self.count))
+        if n == 0:
+            return []  # Also avoids using the buffer of a queue with capacity 0, which is empty
+        drained = self._slice(self.count - n, self.count)
+        self._clear_slice(self.count - n, self.count)
+        self.count -= n
+        drained.reverse()  # Rear item first
+        return drained
     
 
+# Sliding window queue
+# Answers "what is the min/max of the items in the queue" in O(1), for example for the min/max of the
+# last N values: insert each new value at the front and delete the rear one once there are more than N.
+# Besides the items, two monotonic deques keep the only items that can still become the min or the max:
+#   - an item that is bigger than a newer item can never be the minimum again, since it leaves the queue
+#     before the newer one. So it is removed from the min deque when the newer item is inserted.
+#     The items left in the min deque are increasing from oldest to newest, and the oldest is the minimum
+#   - same for the max deque, with smaller items removed
+# Each item enters and leaves each deque once, so insert and delete are O(1) on average.
+# Items must be inserted at the front and deleted from the rear only.
+class WindowQueue(Queue):
+    def __init__(self, capacity=MAX_QUEUE_SIZE):
+        super().__init__(capacity)
+        self.min_candidates = deque()  # Oldest item on the left
+        self.max_candidates = deque()
+
+    def _add(self, item):
+        # Add a new item to the candidates and return the candidates it removed, for _undo_add.
+        # All comparisons are done before changing anything, so if one raises the candidates are unchanged
+        drop_min = 0
+        while drop_min < len(self.min_candidates) and self.min_candidates[-1 - drop_min] > item:
+            drop_min += 1
+        drop_max = 0
+        while drop_max < len(self.max_candidates) and self.max_candidates[-1 - drop_max] < item:
+            drop_max += 1
+
+        dropped_min = [self.min_candidates.pop() for _ in range(drop_min)]
+        dropped_max = [self.max_candidates.pop() for _ in range(drop_max)]
+        self.min_candidates.append(item)
+        self.max_candidates.append(item)
+        return dropped_min, dropped_max
+
+    def _undo_add(self, dropped_min, dropped_max):
+        # Remove the newest item from the candidates and put back the ones it removed
+        self.min_candidates.pop()
+        self.min_candidates.extend(reversed(dropped_min))
+        self.max_candidates.pop()
+        self.max_candidates.extend(reversed(dropped_max))
+
+    def _remove(self, item):
+        # item is the oldest item of the queue. If it is a candidate it is the oldest one
+        if self.min_candidates[0] == item:
+            self.min_candidates.popleft()
+        if self.max_candidates[0] == item:
+            self.max_candidates.popleft()
+
+    def insert_front(self, item):
+        # Update the candidates first and undo it if the queue is full,
+        # so a failing comparison or a full queue leaves both the items and the candidates unchanged
+        dropped = self._add(item)
+        try:
+            super().insert_front(item)
+        except Exception:
+            self._undo_add(*dropped)
+            raise
+
+    def delete_rear(self):
+        item = super().delete_rear()
+        self._remove(item)
+        return item
+
+    def extend(self, items):
+        items = list(items)
+        added = []
+        try:
+            for item in items:
+                added.append(self._add(item))
+            super().extend(items)
+        except Exception:
+            for dropped in reversed(added):
+                self._undo_add(*dropped)
+            raise
+
+    def drain(self, n=None):
+        drained = super().drain(n)
+        for item in drained:
+            self._remove(item)
+        return drained
+
+    def insert_rear(self, item):
+        raise Exception("WindowQueue items can only be inserted at the front")
+
+    def delete_front(self):
+        raise Exception("WindowQueue items can only be deleted from the rear")
+
+    def window_min(self):
+        # Return the smallest item in the queue
+        if self.is_empty():
+            raise Exception("Queue is empty.")
+        return self.min_candidates[0]
+
+    def window_max(self):
+        # Return the biggest item in the queue
+        if self.is_empty():
+            raise Exception("Queue is empty.")
+        return self.max_candidates[0]
+
+
+# Priority queue
+# Items leave the queue in order of priority (smallest priority first) instead of in insertion order.
+# Implemented as a binary min-heap stored in a list: the children of the entry at index i are at 2i+1 and 2i+2,
+# and every entry has a smaller priority than its children, so the smallest is always at index 0.
+# push and pop move one entry up or down the tree: O(log n).
+# Entries are (priority, sequence number, item). The sequence number counts the insertions:
+# items with equal priority leave in insertion order (stable), and items themselves are never compared:
+# sequence numbers are all different, so comparing two entries never gets to the items.
+# positions maps each item to its index in the heap, so decrease_key can find an item in O(1).
+# Items must therefore be hashable, and an item can only be in the queue once.
+class PriorityQueue:
+    def __init__(self, capacity=MAX_QUEUE_SIZE):
+        self.capacity = capacity  # None for a queue without limit
+        self.heap = []
+        self.positions = {}
+        self.sequence = 0
+
+    @classmethod
+    def heapify(cls, items_with_priority, capacity=None):
+        # Build a priority queue from (item, priority) pairs in O(n),
+        # instead of O(n log n) for pushing them one by one.
+        # Unlike PriorityQueue(), there is no size limit by default: heapify is meant for building a queue
+        # from an existing collection of any size, and a default of MAX_QUEUE_SIZE would reject most of them
+        queue = cls(capacity)
+        for item, priority in items_with_priority:
+            if item in queue.positions:
+                raise Exception(f"Item {item} is already in the queue")
+            queue.positions[item] = len(queue.heap)
+            queue.heap.append((priority, queue.sequence, item))
+            queue.sequence += 1
+        if capacity is not None and len(queue.heap) > capacity:
+            raise Exception(f"Queue is full, cannot insert more than {capacity} items")
+
+        # Sift down every entry that has children, from the last one to the root.
+        # Most entries are near the bottom and move only a few levels, which sums up to O(n)
+        for index in reversed(range(len(queue.heap) // 2)):
+            queue._sift_down(index)
+        return queue
+
+    def _place(self, index, entry):
+        self.heap[index] = entry
+        self.positions[entry[2]] = index
+
+    def _sift_up(self, index):
+        # Move the entry at index up while it is smaller than its parent
+        entry = self.heap[index]
+        while index > 0:
+            parent = (index - 1) // 2
+            if entry >= self.heap[parent]:
+                break
+            self._place(index, self.heap[parent])
+            index = parent
+        self._place(index, entry)
+
+    def _sift_down(self, index):
+        # Move the entry at index down while one of its children is smaller
+        heap = self.heap
+        entry = heap[index]
+        while True:
+            child = 2 * index + 1
+            if child >= len(heap):
+                break
+            # Pick the smaller child
+            if child + 1 < len(heap) and heap[child + 1] < heap[child]:
+                child += 1
+            if entry <= heap[child]:
+                break
+            self._place(index, heap[child])
+            index = child
+        self._place(index, entry)
+
+    def is_empty(self):
+        return len(self.heap) == 0
+
+    def is_full(self):
+        return self.capacity is not None and len(self.heap) >= self.capacity
+
+    def size(self):
+        return len(self.heap)
+
+    def push(self, item, priority):
+        # Add item with the given priority
+        if self.is_full():
+            raise Exception(f"Queue is full, cannot insert more than {self.capacity} items")
+        if item in self.positions:
+            raise Exception(f"Item {item} is already in the queue")
+        self.heap.append((priority, self.sequence, item))
+        self.sequence += 1
+        self._sift_up(len(self.heap) - 1)
+
+    def peek(self):
+        # Return the item with the smallest priority, without removing it
+        if self.is_empty():
+            raise Exception("Queue is empty.")
+        return self.heap[0][2]
+
+    def pop(self):
+        # Remove and return the item with the smallest priority
+        if self.is_empty():
+            raise Exception("Queue is empty.")
+        item = self.heap[0][2]
+        del self.positions[item]
+
+        # Move the last entry to the root and let it sink to its place
+        last = self.heap.pop()
+        if self.heap:
+            self._place(0, last)
+            self._sift_down(0)
+        return item
+
+    def decrease_key(self, item, priority):
+        # Give item a smaller priority, so it leaves the queue earlier
+        if item not in self.positions:
+            raise Exception(f"Item {item} is not in the queue")
+        index = self.positions[item]
+        old_priority, sequence, _ = self.heap[index]
+        if priority > old_priority:
+            raise Exception(f"New priority {priority} is bigger than the current priority {old_priority}")
+        self.heap[index] = (priority, sequence, item)
+        self._sift_up(index)
+
+
+# Thread safe queue
+# For producer and consumer threads sharing a queue. A lock makes sure only one thread changes the queue
+# at a time, and put/get wait (block) while the queue is full/empty instead of raising an exception:
+# a producer that is faster than the consumers is slowed down to their speed (backpressure).
+# Every Queue method that reads or changes the items takes the lock, and the ones that insert or delete
+# notify the threads waiting in put/get.
+class ThreadSafeQueue(Queue):
+    def __init__(self, capacity=MAX_QUEUE_SIZE):
+        super().__init__(capacity)
+        self.lock = threading.Lock()
+        self.not_empty = threading.Condition(self.lock)  # Notified when an item is inserted
+        self.not_full = threading.Condition(self.lock)   # Notified when an item is deleted
+
+    def put(self, item, block=True, timeout=None):
+        # Insert item at the front. If the queue is full, wait until there is room
+        # (at most timeout seconds if timeout is given), or raise an exception right away if block is False
+        with self.not_full:
+            if block and not self.not_full.wait_for(lambda: not self.is_full(), timeout):
+                raise Exception(f"Queue is still full after waiting {timeout} seconds")
+            super().insert_front(item)
+            self.not_empty.notify()
+
+    def get(self, block=True, timeout=None):
+        # Delete and return the rear item. If the queue is empty, wait until there is an item
+        # (at most timeout seconds if timeout is given), or raise an exception right away if block is False
+        with self.not_empty:
+            if block and not self.not_empty.wait_for(lambda: not self.is_empty(), timeout):
+                raise Exception(f"Queue is still empty after waiting {timeout} seconds")
+            item = super().delete_rear()
+            self.not_full.notify()
+            return item
+
+    def insert_front(self, item):
+        # Same as Queue.insert_front (raises if full), but thread safe
+        self.put(item, block=False)
+
+    def delete_rear(self):
+        # Same as Queue.delete_rear (raises if empty), but thread safe
+        return self.get(block=False)
+
+    def insert_rear(self, item):
+        with self.lock:
+            super().insert_rear(item)
+            self.not_empty.notify()
+
+    def delete_front(self):
+        with self.lock:
+            item = super().delete_front()
+            self.not_full.notify()
+            return item
+
+    def extend(self, items):
+        items = list(items)
+        with self.lock:
+            super().extend(items)
+            self.not_empty.notify(len(items))
+
+    def drain(self, n=None):
+        with self.lock:
+            drained = super().drain(n)
+            self.not_full.notify(len(drained))
+            return drained
+
+    def front(self):
+        with self.lock:
+            return super().front()
+
+    def rear(self):
+        with self.lock:
+            return super().rear()
+
+
+# Asyncio queue
+# Same as ThreadSafeQueue, for coroutines running in one asyncio event loop: put and get are awaited,
+# so while they wait for room or for an item the event loop runs the other coroutines.
+# Only one coroutine runs at a time and nothing is awaited between checking the queue and changing it,
+# so no lock is needed. A waiting coroutine waits on a future in getters or putters, and the Queue methods
+# that insert or delete items stay plain methods that never wait (like asyncio.Queue.put_nowait):
+# they complete the futures of the coroutines that can now continue.
+class AsyncQueue(Queue):
+    def __init__(self, capacity=MAX_QUEUE_SIZE):
+        super().__init__(capacity)
+        self.getters = deque()  # Futures of the coroutines waiting for an item
+        self.putters = deque()  # Futures of the coroutines waiting for room
+
+    def _wake_up(self, waiters, n=1):
+        # Wake up to n waiting coroutines, oldest first.
+        # They check the queue again when they run, as another coroutine may have been faster
+        while waiters and n > 0:
+            waiter = waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                n -= 1
+
+    async def _wait(self, waiters, ready, timeout, message):
+        # Wait until ready() is true (at most timeout seconds)
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while not ready():
+            waiter = loop.create_future()
+            waiters.append(waiter)
+            try:
+                await asyncio.wait_for(waiter, None if deadline is None else deadline - loop.time())
+            except BaseException as error:
+                waiter.cancel()
+                if waiter in waiters:
+                    waiters.remove(waiter)
+                if ready():
+                    self._wake_up(waiters)  # This coroutine may have been woken up, pass it on
+                if isinstance(error, asyncio.TimeoutError):
+                    raise Exception(message)
+                raise
+
+    async def put(self, item, timeout=None):
+        # Insert item at the front, waiting for room if the queue is full (at most timeout seconds)
+        await self._wait(self.putters, lambda: not self.is_full(), timeout,
+                         f"Queue is still full after waiting {timeout} seconds")
+        self.insert_front(item)
+
+    async def get(self, timeout=None):
+        # Delete and return the rear item, waiting for an item if the queue is empty (at most timeout seconds)
+        await self._wait(self.getters, lambda: not self.is_empty(), timeout,
+                         f"Queue is still empty after waiting {timeout} seconds")
+        return self.delete_rear()
+
+    def insert_front(self, item):
+        # Same as Queue.insert_front (raises if full), and wakes up a coroutine waiting in get
+        super().insert_front(item)
+        self._wake_up(self.getters)
+
+    def insert_rear(self, item):
+        super().insert_rear(item)
+        self._wake_up(self.getters)
+
+    def extend(self, items):
+        items = list(items)
+        super().extend(items)
+        self._wake_up(self.getters, len(items))
+
+    def delete_rear(self):
+        # Same as Queue.delete_rear (raises if empty), and wakes up a coroutine waiting in put
+        item = super().delete_rear()
+        self._wake_up(self.putters)
+        return item
+
+    def delete_front(self):
+        item = super().delete_front()
+        self._wake_up(self.putters)
+        return item
+
+    def drain(self, n=None):
+        drained = super().drain(n)
+        self._wake_up(self.putters, len(drained))
+        return drained
+
+
+# Persistent queue
+# Items are stored on disk, so the queue survives a restart of the program and is not limited by memory.
+# The data is split in segment files of SEGMENT_SIZE bytes in a directory:
+#   - each segment starts with a header: (end of the data in the segment, number of items in the segment)
+#   - then the items one after the other, each one as its length (4 bytes) followed by the pickled item
+# New items are appended to the newest segment, a new segment is started when it is full.
+# Items are deleted from the oldest segment. The read position is kept in the file "read.pos"
+# as (segment number, offset in segment, number of items already read in segment).
+# A segment whose items have all been read is recycled: it is kept as the spare segment and
+# reused as the next new segment, so no new file and no new disk blocks have to be allocated.
+# PersistentStack (stack.py) uses the same segment files: SEGMENT_SIZE, SEGMENT_HEADER, ITEM_LENGTH,
+# _create_segment, _recycle_segment and _sync_directory are the same in both files, change them together.
+# Segments are memory mapped: writes go to the operating system's page cache, which survives a crash
+# of the program. To also survive a power failure they must be written to the disk (fsync), which is slow,
+# so it is done once every sync_every operations, and by flush() and close(). flush() also syncs the
+# directory when segment files were created, renamed or deleted, so the files themselves are on disk.
+
+SEGMENT_SIZE = 1024 * 1024
+SEGMENT_HEADER = struct.Struct("<QQ")     # End of data, number of items
+READ_POSITION = struct.Struct("<QQQ")     # Segment number, offset, items read in segment
+ITEM_LENGTH = struct.Struct("<I")
+
+class PersistentQueue:
+    def __init__(self, directory, segment_size=SEGMENT_SIZE, sync_every=1000):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.segment_size = segment_size
+        self.sync_every = sync_every
+        self.unsynced = 0     # Operations since the last flush
+        self.directory_changed = True  # Files created, renamed or deleted since the last flush
+        self.segments = {}    # Segment number -> (file, mmap) of the open segments (oldest and newest)
+
+        # Read position, kept in a small memory mapped file
+        position_path = os.path.join(directory, "read.pos")
+        self.position_file = open(position_path, "a+b")
+        if os.path.getsize(position_path) < READ_POSITION.size:
+            self.position_file.truncate(READ_POSITION.size)
+        self.position = mmap.mmap(self.position_file.fileno(), READ_POSITION.size)
+        self.read_segment, self.read_offset, self.read_items = READ_POSITION.unpack_from(self.position)
+
+        numbers = sorted(int(name[:-4]) for name in os.listdir(directory) if name[:-4].isdigit() and name.endswith(".seg"))
+        # Segments before the read segment are fully read. One is left if the program stopped
+        # between moving the read position and recycling the segment
+        for number in numbers:
+            if number < self.read_segment:
+                self._recycle_segment(number)
+        numbers = [number for number in numbers if number >= self.read_segment]
+        if not numbers:
+            numbers = [self.read_segment]
+            self._create_segment(self.read_segment, segment_size)
+        self.write_segment = numbers[-1]
+
+        # Number of items: items of every segment from the read segment on, minus the ones already read
+        self.count = sum(self._header(number)[1] for number in numbers) - self.read_items
+        for number in numbers:
+            if number not in (self.read_segment, self.write_segment):
+                self._close_segment(number)
+
+    def _path(self, number):
+        return os.path.join(self.directory, f"{number:012d}.seg")
+
+    def _segment(self, number):
+        # Return the mmap of segment number, opening it if needed
+        if number not in self.segments:
+            file = open(self._path(number), "r+b")
+            self.segments[number] = (file, mmap.mmap(file.fileno(), 0))
+        return self.segments[number][1]
+
+    def _close_segment(self, number):
+        if number in self.segments:
+            file, data = self.segments.pop(number)
+            data.close()
+            file.close()
+
+    def _header(self, number):
+        return SEGMENT_HEADER.unpack_from(self._segment(number))
+
+    def _create_segment(self, number, size):
+        # Create an empty segment, reusing the spare segment if there is one.
+        # Only the header of a reused segment is reset: its old items are after the end of the data,
+        # so they are never read, and its disk blocks are kept instead of being allocated again.
+        # The file gets its segment name only once its header is written, so a crash never leaves
+        # a segment without a valid header
+        new_path = os.path.join(self.directory, "spare.seg")
+        if not os.path.exists(new_path):
+            new_path = os.path.join(self.directory, "new.seg")
+        with open(new_path, "r+b" if os.path.exists(new_path) else "w+b") as file:
+            file.write(SEGMENT_HEADER.pack(SEGMENT_HEADER.size, 0))
+            if os.fstat(file.fileno()).st_size < size:
+                file.truncate(size)  # Extending a file fills it with zeros without writing them
+        os.replace(new_path, self._path(number))
+        self.directory_changed = True
+
+    def _recycle_segment(self, number):
+        # Keep a segment that is not needed anymore as the spare segment, or delete it if there is already a spare
+        spare_path = os.path.join(self.directory, "spare.seg")
+        if os.path.exists(spare_path):
+            os.remove(self._path(number))
+        else:
+            os.replace(self._path(number), spare_path)
+        self.directory_changed = True
+
+    def _sync_directory(self):
+        # Created, renamed and deleted segment files are only on disk once the directory is synced too
+        if self.directory_changed:
+            directory = os.open(self.directory, os.O_RDONLY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+            self.directory_changed = False
+
+    def _operation_done(self):
+        self.unsynced += 1
+        if self.unsynced >= self.sync_every:
+            self.flush()
+
+    def is_empty(self):
+        return self.count == 0
+
+    def size(self):
+        return self.count
+
+    def insert_front(self, item):
+        # Add item to the front of the queue (append it to the newest segment)
+        data = pickle.dumps(item)
+        record_size = ITEM_LENGTH.size + len(data)
+        end, items = self._header(self.write_segment)
+
+        # Start a new segment if the item does not fit. Items bigger than a segment get a bigger segment
+        if end + record_size > len(self._segment(self.write_segment)):
+            if self.write_segment != self.read_segment:
+                self._close_segment(self.write_segment)
+            self.write_segment += 1
+            self._create_segment(self.write_segment, max(self.segment_size, SEGMENT_HEADER.size + record_size))
+            end, items = SEGMENT_HEADER.size, 0
+
+        segment = self._segment(self.write_segment)
+        ITEM_LENGTH.pack_into(segment, end, len(data))
+        segment[end + ITEM_LENGTH.size:end + record_size] = data
+        # Update the header last: if the program stops before, the item is simply not there
+        SEGMENT_HEADER.pack_into(segment, 0, end + record_size, items + 1)
+        self.count += 1
+        self._operation_done()
+
+    def _next_record(self):
+        # Move the read position to the next segment if the read segment is fully read
+        # and return (segment, offset) of the rear item
+        if self.read_items == self._header(self.read_segment)[1]:
+            old_segment = self.read_segment
+            self.read_segment, self.read_offset, self.read_items = old_segment + 1, SEGMENT_HEADER.size, 0
+            READ_POSITION.pack_into(self.position, 0, self.read_segment, self.read_offset, self.read_items)
+            self._close_segment(old_segment)
+            self._recycle_segment(old_segment)
+        if self.read_offset == 0:
+            self.read_offset = SEGMENT_HEADER.size  # New queue, nothing read yet
+        return self._segment(self.read_segment), self.read_offset
+
+    def rear(self):
+        # Check the rear element in the queue (the oldest one)
+        if self.is_empty():
+            raise Exception("Queue is empty.")
+        segment, offset = self._next_record()
+        length, = ITEM_LENGTH.unpack_from(segment, offset)
+        return pickle.loads(segment[offset + ITEM_LENGTH.size:offset + ITEM_LENGTH.size + length])
+
+    def delete_rear(self):
+        # Remove and return the rear item from the queue
+        if self.is_empty():
+            raise Exception("Queue is empty.")
+        segment, offset = self._next_record()
+        length, = ITEM_LENGTH.unpack_from(segment, offset)
+        item = pickle.loads(segment[offset + ITEM_LENGTH.size:offset + ITEM_LENGTH.size + length])
+
+        self.read_offset = offset + ITEM_LENGTH.size + length
+        self.read_items += 1
+        READ_POSITION.pack_into(self.position, 0, self.read_segment, self.read_offset, self.read_items)
+        self.count -= 1
+        self._operation_done()
+        return item
+
+    def flush(self):
+        # Write everything to disk
+        for _, data in self.segments.values():
+            data.flush()
+        self.position.flush()
+        self._sync_directory()
+        self.unsynced = 0
+
+    def close(self):
+        self.flush()
+        for number in list(self.segments):
+            self._close_segment(number)
+        self.position.close()
+        self.position_file.close()
+
+
+# Benchmark
+# Moves items from one producer to one consumer through each queue and prints the items per second.
+# Run "python queue.py benchmark"
+
+def _stdlib_queue_module():
+    # This file is also named queue.py. When it is run as a script, "import queue" would import this file,
+    # so load the standard library queue.py from the folder of another standard library module
+    path = os.path.join(os.path.dirname(threading.__file__), "queue.py")
+    spec = importlib.util.spec_from_file_location("stdlib_queue", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+def _threaded_throughput(put, get, items):
+    # Time a producer thread putting items and the main thread getting them
+    producer = threading.Thread(target=lambda: [put(i) for i in range(items)])
+    start = time.perf_counter()
+    producer.start()
+    for _ in range(items):
+        get()
+    producer.join()
+    return items / (time.perf_counter() - start)
+
+async def _async_throughput(put, get, items):
+    # Time a producer task putting items and the current task getting them
+    async def produce():
+        for i in range(items):
+            await put(i)
+
+    start = time.perf_counter()
+    producer = asyncio.create_task(produce())
+    for _ in range(items):
+        await get()
+    await producer
+    return items / (time.perf_counter() - start)
+
+def benchmark_queues(items=100_000, capacity=1000):
+    stdlib_queue = _stdlib_queue_module()
+
+    thread_safe = ThreadSafeQueue(capacity)
+    stdlib_thread_queue = stdlib_queue.Queue(capacity)
+    print(f"ThreadSafeQueue:     {_threaded_throughput(thread_safe.put, thread_safe.get, items):>10.0f} items/s")
+    print(f"queue.Queue:         {_threaded_throughput(stdlib_thread_queue.put, stdlib_thread_queue.get, items):>10.0f} items/s")
+
+    async def run_async():
+        async_queue = AsyncQueue(capacity)
+        stdlib_async_queue = asyncio.Queue(capacity)
+        print(f"AsyncQueue:          {await _async_throughput(async_queue.put, async_queue.get, items):>10.0f} items/s")
+        print(f"asyncio.Queue:       {await _async_throughput(stdlib_async_queue.put, stdlib_async_queue.get, items):>10.0f} items/s")
+    asyncio.run(run_async())
+
+
 if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "benchmark":
+        benchmark_queues()
+        sys.exit()
+
     # Create a queue
     queue = Queue()
 
@@ -77,4 +822,44 @@ if __name__ == "__main__":
             print("Deleted item from rear:", queue.delete_rear())
         except Exception as e:
             print(f"Cannot delete from queue. Reason: {e}")
-            break
\ No newline at end of file
+            break
+
+    # Queue without size limit, with bulk insert and delete
+    big_queue = Queue(capacity=None)
+    big_queue.extend(range(1, 101))
+    print("Queue size:", big_queue.size(), "Front:", big_queue.front(), "Rear:", big_queue.rear())  # 100 100 1
+    print("Drained:", big_queue.drain(5))  # [1, 2, 3, 4, 5]
+
+    # Producer and consumer threads sharing a queue of 3 items: the producer waits when it is full
+    shared_queue = ThreadSafeQueue(capacity=3)
+    consumer = threading.Thread(target=lambda: print("Consumed:", [shared_queue.get() for _ in range(10)]))
+    consumer.start()
+    for i in range(10):
+        shared_queue.put(i)
+    consumer.join()
+
+    # Min and max of the last 3 values
+    window = WindowQueue(capacity=3)
+    for value in [4, 2, 12, 3, 8, 1]:
+        if window.is_full():
+            window.delete_rear()
+        window.insert_front(value)
+        print(f"Inserted {value}, window min: {window.window_min()}, max: {window.window_max()}")
+
+    # Priority queue: smallest priority first, equal priorities in insertion order
+    tasks = PriorityQueue.heapify([("write report", 3), ("fix bug", 1), ("reply email", 3), ("deploy", 2)])
+    tasks.decrease_key("reply email", 2)
+    print("Tasks by priority:", [tasks.pop() for _ in range(tasks.size())])
+    # ['fix bug', 'reply email', 'deploy', 'write report']
+
+    # Persistent queue: items are still there after closing and opening it again
+    with tempfile.TemporaryDirectory() as directory:
+        spool = PersistentQueue(directory, segment_size=64)
+        for job in ["job 1", "job 2", "job 3", "job 4", "job 5"]:
+            spool.insert_front(job)
+        print("Processed:", spool.delete_rear())  # job 1
+        spool.close()
+
+        spool = PersistentQueue(directory, segment_size=64)
+        print("After restart, size:", spool.size(), "next:", spool.delete_rear())  # 4 job 2
+        spool.close()
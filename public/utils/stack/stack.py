@@ -1,12 +1,20 @@
 # Stack implementation using python 
 
+import os
+import mmap
+from array import array
+import pickle
+import struct
+import tempfile
 
 MAX_STACK_SIZE = 15
 
 class Stack:
-    def __init__(self):
+    def __init__(self, capacity=MAX_STACK_SIZE):
         # Initialize empty list to store stack elements.
+        # capacity: maximum number of items, None for a stack without limit
         self.stack_items = []
+        self.capacity = capacity
 
     def is_empty(self):
         # Check if stack is empty or not.
@@ -14,14 +22,14 @@ class Stack:
     
     def is_full(self):
         # Check if stack is full
-        return len(self.stack_items) >= MAX_STACK_SIZE
+        return self.capacity is not None and len(self.stack_items) >= self.capacity
     
     def push(self, item):
         # Add item to stack
         if not self.is_full():
             self.stack_items.append(item)
         else:
-            raise Exception(f"Stack is full, cannot push more than {MAX_STACK_SIZE} items")
+            raise Exception(f"Stack is full, cannot push more than {self.capacity} items")
         
     def pop(self):
         # Remove and return the top item from the stack
@@ -42,6 +50,243 @@ class Stack:
         return len(self.stack_items)
     
 
+# Typed stack
+# Stores numbers in an array.array instead of a list: each item takes a fixed number of bytes
+# (8 for typecode 'q' or 'd') in one contiguous block of memory, instead of one Python object per item.
+# push, pop and top are inherited from Stack, they work the same on an array.
+# push_many and pop_many move many items in one operation instead of one call per item.
+class TypedStack(Stack):
+    def __init__(self, typecode='q', capacity=MAX_STACK_SIZE):
+        super().__init__(capacity)
+        self.stack_items = array(typecode)
+
+    def push_many(self, items):
+        # Push all items, in order (the last one ends up on top).
+        # Either all items are pushed or, if they do not fit, none of them
+        items = array(self.stack_items.typecode, items)
+        if self.capacity is not None and len(self.stack_items) + len(items) > self.capacity:
+            raise Exception(f"Stack is full, cannot push more than {self.capacity} items")
+        self.stack_items.extend(items)
+
+    def pop_many(self, n):
+        # Remove up to n items from the top and return them as an array,
+        # in the order pop would have returned them (top item first)
+        start = max(len(self.stack_items) - n, 0)
+        popped = self.stack_items[start:]
+        del self.stack_items[start:]
+        popped.reverse()
+        return popped
+
+    def view(self):
+        # Return a memoryview of the items (bottom first), without copying them.
+        # The stack cannot grow or shrink while a view exists: call release() on the view first
+        return memoryview(self.stack_items)
+
+
+# Stack with running aggregates
+# Keeps, for every item, the min, max and sum of that item and all the items below it.
+# The aggregates of the whole stack are then those of the top item, so min(), max() and sum() are O(1),
+# and pop just drops the aggregates of the top item (the ones below are still correct).
+class AggregateStack(Stack):
+    def __init__(self, capacity=MAX_STACK_SIZE):
+        super().__init__(capacity)
+        self.aggregates = []  # (min, max, sum) of each item and the items below it
+
+    def push(self, item):
+        # Compute the aggregates first: if item cannot be compared or added, nothing is pushed
+        if self.aggregates:
+            low, high, total = self.aggregates[-1]
+            aggregates = (min(low, item), max(high, item), total + item)
+        else:
+            aggregates = (item, item, item)
+        super().push(item)
+        self.aggregates.append(aggregates)
+
+    def pop(self):
+        item = super().pop()
+        self.aggregates.pop()
+        return item
+
+    def _top_aggregates(self):
+        if self.is_empty():
+            raise Exception("Stack is empty.")
+        return self.aggregates[-1]
+
+    def min(self):
+        # Return the smallest item in the stack
+        return self._top_aggregates()[0]
+
+    def max(self):
+        # Return the biggest item in the stack
+        return self._top_aggregates()[1]
+
+    def sum(self):
+        # Return the sum of the items in the stack (0 if it is empty)
+        return self.aggregates[-1][2] if self.aggregates else 0
+
+
+# Persistent stack
+# Items are stored on disk, so the stack survives a restart of the program and is not limited by memory.
+# The data is split in segment files of SEGMENT_SIZE bytes numbered 0, 1, 2, ... in a directory:
+#   - each segment starts with a header: (end of the data in the segment, number of items in the segment)
+#   - then the items one after the other, each one as the pickled item followed by its length (4 bytes).
+#     The length is after the item so that the top item can be found by reading backwards from the end
+# Items are pushed to and popped from the newest segment. When it becomes empty it is recycled:
+# it is kept as the spare segment and reused when a new segment is needed.
+# Segments are memory mapped and written to the disk like the segments of PersistentQueue (queue.py).
+# SEGMENT_SIZE, SEGMENT_HEADER, ITEM_LENGTH, _create_segment, _recycle_segment and _sync_directory
+# are the same as in queue.py, change them together.
+
+SEGMENT_SIZE = 1024 * 1024
+SEGMENT_HEADER = struct.Struct("<QQ")  # End of data, number of items
+ITEM_LENGTH = struct.Struct("<I")
+
+class PersistentStack:
+    def __init__(self, directory, segment_size=SEGMENT_SIZE, sync_every=1000):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.segment_size = segment_size
+        self.sync_every = sync_every
+        self.unsynced = 0  # Operations since the last flush
+        self.directory_changed = True  # Files created, renamed or deleted since the last flush
+
+        numbers = sorted(int(name[:-4]) for name in os.listdir(directory) if name[:-4].isdigit() and name.endswith(".seg"))
+        self.top_segment = numbers[-1] if numbers else 0
+        if not numbers:
+            self._create_segment(0, segment_size)
+
+        # Number of items: sum of the items of each segment
+        self.count = 0
+        for number in range(self.top_segment + 1):
+            self._open(number)
+            self.count += SEGMENT_HEADER.unpack_from(self.data)[1]
+            if number != self.top_segment:
+                self._close()
+
+    def _path(self, number):
+        return os.path.join(self.directory, f"{number:012d}.seg")
+
+    def _open(self, number):
+        # Memory map segment number. Only one segment (the top one) is open at a time
+        self.file = open(self._path(number), "r+b")
+        self.data = mmap.mmap(self.file.fileno(), 0)
+
+    def _close(self):
+        self.data.close()
+        self.file.close()
+
+    def _create_segment(self, number, size):
+        # Create an empty segment, reusing the spare segment if there is one.
+        # Only the header of a reused segment is reset: its old items are after the end of the data,
+        # so they are never read, and its disk blocks are kept instead of being allocated again.
+        # The file gets its segment name only once its header is written, so a crash never leaves
+        # a segment without a valid header
+        new_path = os.path.join(self.directory, "spare.seg")
+        if not os.path.exists(new_path):
+            new_path = os.path.join(self.directory, "new.seg")
+        with open(new_path, "r+b" if os.path.exists(new_path) else "w+b") as file:
+            file.write(SEGMENT_HEADER.pack(SEGMENT_HEADER.size, 0))
+            if os.fstat(file.fileno()).st_size < size:
+                file.truncate(size)  # Extending a file fills it with zeros without writing them
+        os.replace(new_path, self._path(number))
+        self.directory_changed = True
+
+    def _recycle_segment(self, number):
+        # Keep a segment that is not needed anymore as the spare segment, or delete it if there is already a spare
+        spare_path = os.path.join(self.directory, "spare.seg")
+        if os.path.exists(spare_path):
+            os.remove(self._path(number))
+        else:
+            os.replace(self._path(number), spare_path)
+        self.directory_changed = True
+
+    def _sync_directory(self):
+        # Created, renamed and deleted segment files are only on disk once the directory is synced too
+        if self.directory_changed:
+            directory = os.open(self.directory, os.O_RDONLY)
+            try:
+                os.fsync(directory)
+            finally:
+                os.close(directory)
+            self.directory_changed = False
+
+    def _operation_done(self):
+        self.unsynced += 1
+        if self.unsynced >= self.sync_every:
+            self.flush()
+
+    def is_empty(self):
+        return self.count == 0
+
+    def size(self):
+        return self.count
+
+    def push(self, item):
+        # Add item to the top of the stack
+        data = pickle.dumps(item)
+        record_size = len(data) + ITEM_LENGTH.size
+        end, items = SEGMENT_HEADER.unpack_from(self.data)
+
+        # Start a new segment if the item does not fit. Items bigger than a segment get a bigger segment.
+        # An empty top segment is replaced instead of leaving it empty below the new one
+        if end + record_size > len(self.data):
+            self.data.flush()
+            self._close()
+            if items > 0:
+                self.top_segment += 1
+            self._create_segment(self.top_segment, max(self.segment_size, SEGMENT_HEADER.size + record_size))
+            self._open(self.top_segment)
+            end, items = SEGMENT_HEADER.size, 0
+
+        self.data[end:end + len(data)] = data
+        ITEM_LENGTH.pack_into(self.data, end + len(data), len(data))
+        # Update the header last: if the program stops before, the item is simply not there
+        SEGMENT_HEADER.pack_into(self.data, 0, end + record_size, items + 1)
+        self.count += 1
+        self._operation_done()
+
+    def _top_record(self):
+        # Return (end of data, number of items, start of the top item, length of the top item)
+        # While the top segment is empty, recycle it and move to the segment below
+        end, items = SEGMENT_HEADER.unpack_from(self.data)
+        while items == 0:
+            self._close()
+            self._recycle_segment(self.top_segment)
+            self.top_segment -= 1
+            self._open(self.top_segment)
+            end, items = SEGMENT_HEADER.unpack_from(self.data)
+        length, = ITEM_LENGTH.unpack_from(self.data, end - ITEM_LENGTH.size)
+        return end, items, end - ITEM_LENGTH.size - length, length
+
+    def pop(self):
+        # Remove and return the top item from the stack
+        if self.is_empty():
+            raise Exception("Stack is empty.")
+        end, items, start, length = self._top_record()
+        item = pickle.loads(self.data[start:start + length])
+        SEGMENT_HEADER.pack_into(self.data, 0, start, items - 1)
+        self.count -= 1
+        self._operation_done()
+        return item
+
+    def top(self):
+        # Check the top element in the stack
+        if self.is_empty():
+            raise Exception("stack is empty.")
+        end, items, start, length = self._top_record()
+        return pickle.loads(self.data[start:start + length])
+
+    def flush(self):
+        # Write everything to disk
+        self.data.flush()
+        self._sync_directory()
+        self.unsynced = 0
+
+    def close(self):
+        self.flush()
+        self._close()
+
+
 if __name__ == "__main__":
     # create a stack
     stack  = Stack()
@@ -75,3 +320,29 @@ if __name__ == "__main__":
         except Exception as e:
             print(f"cannot pop from stack. Reason: {e}")
             break
+
+    # Persistent stack: items are still there after closing and opening it again
+    with tempfile.TemporaryDirectory() as directory:
+        spool = PersistentStack(directory, segment_size=64)
+        for job in ["job 1", "job 2", "job 3", "job 4", "job 5"]:
+            spool.push(job)
+        print("Processed:", spool.pop())  # job 5
+        spool.close()
+
+        spool = PersistentStack(directory, segment_size=64)
+        print("After restart, size:", spool.size(), "top:", spool.pop())  # 4 job 4
+        spool.close()
+
+    # Typed stack of integers without size limit, with bulk push and pop
+    work_stack = TypedStack('q', capacity=None)
+    work_stack.push_many(range(100))
+    print("Popped:", work_stack.pop_many(3).tolist())  # [99, 98, 97]
+    with work_stack.view() as items:
+        print("Sum of items:", sum(items))  # 4656
+
+    # Stack keeping track of min, max and sum
+    metrics = AggregateStack()
+    for value in [5, 3, 8, 1]:
+        metrics.push(value)
+    metrics.pop()
+    print("Min:", metrics.min(), "Max:", metrics.max(), "Sum:", metrics.sum())  # 3 8 16